@@ -1,6 +1,31 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
 class AiServiceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_service'
+
+    def ready(self):
+        # Load the semantic cache embedding model at startup instead of on the first request
+        if not _is_serving_process():
+            return
+
+        from .semantic_cache import get_semantic_cache
+        get_semantic_cache().warm_up()
+
+
+def _is_serving_process():
+    """
+    True for the runserver child process, and for processes launched with
+    SEMANTIC_CACHE_PREWARM enabled (set it for gunicorn and Celery workers).
+    Migrations, shells, scripts and tests leave the model unloaded.
+    """
+    from django.conf import settings
+    if settings.AI_SERVICE_CONFIG.get('SEMANTIC_CACHE_PREWARM', False):
+        return True
+    if len(sys.argv) < 2 or sys.argv[1] != 'runserver':
+        return False
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
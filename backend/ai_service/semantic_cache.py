@@ -0,0 +1,232 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Scale mapping L2-normalized embedding components in [-1, 1] onto int8
+INT8_SCALE = 127
+
+
+class QuantizedEmbedder:
+    """
+    Sentence embedder running an int8 dynamically quantized ONNX export of
+    the model, with mean pooling. Mirrors SentenceTransformer.encode for a
+    single text.
+    """
+
+    def __init__(self, model_name: str, save_dir: str):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        if not os.path.isdir(save_dir):
+            # Export and quantize once, later processes load the saved model
+            model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=save_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+            )
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(save_dir)
+
+        self.model = ORTModelForFeatureExtraction.from_pretrained(save_dir, file_name='model_quantized.onnx')
+        self.tokenizer = AutoTokenizer.from_pretrained(save_dir)
+
+    def encode(self, text: str, normalize_embeddings: bool = True):
+        import numpy as np
+
+        inputs = self.tokenizer(text, return_tensors='np', truncation=True)
+        hidden = self.model(**inputs).last_hidden_state[0]
+        mask = inputs['attention_mask'][0][:, np.newaxis]
+        embedding = (hidden * mask).sum(axis=0) / max(mask.sum(), 1)
+        if normalize_embeddings:
+            embedding = embedding / np.linalg.norm(embedding)
+        return embedding
+
+
+class SemanticCache:
+    """
+    In-process prompt/response cache for AI provider calls.
+    Prompts are matched exactly by SHA-256 first, then by cosine similarity
+    of the sentence embedding of their request-specific text (e.g. the task
+    title and description, not the shared context appended to every prompt)
+    so near-duplicate requests reuse a response.
+    """
+
+    def __init__(self, model_name: str, threshold: float = 0.92, ttl: int = 3600,
+                 max_entries: int = 1000, enabled: bool = True, quantized_dir: str = None):
+        self.model_name = model_name
+        # When set, embeddings come from an int8 ONNX model and are stored as int8
+        self.quantized_dir = quantized_dir
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self._embedder = None
+        self._embedder_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+        # Exact-match store: sha256 -> (response, expires_at)
+        self._exact = {}
+
+        # Vector store: parallel lists, embeddings are L2-normalized
+        # (scaled by INT8_SCALE and stored as int8 when quantized)
+        self._keys = []
+        self._namespaces = []
+        self._vectors = None
+        self._expires = []
+
+    @staticmethod
+    def make_key(prompt: str, namespace: str = '') -> str:
+        """Deterministic key for a prompt and the model parameters answering it"""
+        return hashlib.sha256(f"{namespace}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def _get_embedder(self):
+        """Load the sentence embedding model on first use, once across concurrent callers"""
+        if self._embedder is None:
+            with self._embedder_lock:
+                if self._embedder is None and self.enabled:
+                    try:
+                        if self.quantized_dir:
+                            self._embedder = QuantizedEmbedder(self.model_name, self.quantized_dir)
+                        else:
+                            from sentence_transformers import SentenceTransformer
+                            self._embedder = SentenceTransformer(self.model_name)
+                    except Exception as e:
+                        logger.warning("Semantic cache disabled, embedding model unavailable: %s", e)
+                        self.enabled = False
+        return self._embedder
+
+    def warm_up(self):
+        """Load the embedding model and run one encode so the first request does not pay for it"""
+        if self.enabled:
+            self._encode('warmup')
+
+    def _encode(self, prompt: str):
+        embedder = self._get_embedder()
+        if embedder is None:
+            return None
+        return embedder.encode(prompt, normalize_embeddings=True)
+
+    def get(self, prompt: str, namespace: str = '', text: str = None) -> Optional[str]:
+        """Return a cached response for the prompt, or None on a miss. text is embedded instead of the prompt"""
+        return self.lookup(prompt, namespace, text)[0]
+
+    def lookup(self, prompt: str, namespace: str = '', text: str = None):
+        """
+        Like get(), returning (response, embedding). On a miss, pass the embedding
+        (None if none was computed) to set() so the text is not encoded twice.
+        """
+        if not self.enabled:
+            return None, None
+
+        now = time.time()
+        key = self.make_key(prompt, namespace)
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry and entry[1] > now:
+                return entry[0], None
+            has_vectors = namespace in self._namespaces
+
+        if not has_vectors:
+            return None, None
+
+        embedding = self._encode(text or prompt)
+        if embedding is None:
+            return None, None
+
+        with self._lock:
+            if not self._keys:
+                return None, embedding
+            import numpy as np
+
+            # Only prompts sent with the same model parameters and instructions can match
+            in_namespace = np.array([ns == namespace for ns in self._namespaces])
+            scores = np.where(in_namespace, self._similarities(embedding), -1.0)
+            best = int(scores.argmax())
+            if scores[best] < self.threshold or self._expires[best] <= now:
+                return None, embedding
+            entry = self._exact.get(self._keys[best])
+            return (entry[0] if entry else None), embedding
+
+    def set(self, prompt: str, response: str, namespace: str = '', text: str = None, embedding=None):
+        """
+        Store a provider response for the prompt, indexed by the embedding of text
+        (default: the prompt), or by the embedding already computed by lookup()
+        """
+        if not self.enabled:
+            return
+
+        if embedding is None:
+            embedding = self._encode(text or prompt)
+        if embedding is None:
+            return
+
+        import numpy as np
+
+        key = self.make_key(prompt, namespace)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._evict_expired()
+            if key not in self._exact:
+                row = self._index_vector(embedding)[np.newaxis, :]
+                self._vectors = row if self._vectors is None else np.vstack([self._vectors, row])
+                self._keys.append(key)
+                self._namespaces.append(namespace)
+                self._expires.append(expires_at)
+            self._exact[key] = (response, expires_at)
+
+    def _index_vector(self, embedding):
+        """Vector as stored in the index"""
+        import numpy as np
+
+        if self.quantized_dir:
+            return np.round(np.asarray(embedding) * INT8_SCALE).astype(np.int8)
+        return np.asarray(embedding, dtype=np.float32)
+
+    def _similarities(self, embedding):
+        """Cosine similarity of the embedding against every stored vector"""
+        import numpy as np
+
+        if self.quantized_dir:
+            query = self._index_vector(embedding).astype(np.int32)
+            return (self._vectors.astype(np.int32) @ query) / (INT8_SCALE * INT8_SCALE)
+        return self._vectors @ embedding
+
+    def _evict_expired(self):
+        """Drop expired entries and trim to max_entries (oldest first)"""
+        now = time.time()
+        keep = [i for i, expires_at in enumerate(self._expires) if expires_at > now]
+        keep = keep[-(self.max_entries - 1):] if self.max_entries > 1 else []
+        if len(keep) == len(self._keys):
+            return
+
+        kept_keys = [self._keys[i] for i in keep]
+        for key in set(self._keys) - set(kept_keys):
+            self._exact.pop(key, None)
+        self._keys = kept_keys
+        self._namespaces = [self._namespaces[i] for i in keep]
+        self._expires = [self._expires[i] for i in keep]
+        self._vectors = self._vectors[keep] if keep else None
+
+
+@lru_cache(maxsize=1)
+def get_semantic_cache() -> SemanticCache:
+    """Process-wide semantic cache shared by every AIService instance"""
+    config = settings.AI_SERVICE_CONFIG
+    return SemanticCache(
+        model_name=config.get('EMBEDDING_MODEL', 'sentence-transformers/all-MiniLM-L6-v2'),
+        threshold=config.get('SEMANTIC_CACHE_THRESHOLD', 0.92),
+        ttl=config.get('SEMANTIC_CACHE_TTL', 3600),
+        max_entries=config.get('SEMANTIC_CACHE_MAX_ENTRIES', 1000),
+        enabled=config.get('SEMANTIC_CACHE_ENABLED', True),
+        quantized_dir=config.get('EMBEDDING_QUANTIZED_DIR') if config.get('EMBEDDING_QUANTIZE') else None,
+    )
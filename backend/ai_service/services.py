@@ -1,15 +1,197 @@
 import os
-import json
+import ciso8601
+import orjson
+import hashlib
+import logging
+import re
 import requests
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from string import Template
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from django.conf import settings
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.schema import HumanMessage
-from langchain.callbacks.manager import CallbackManager
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import Substr
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from tasks.models import ContextEntry
+from .semantic_cache import get_semantic_cache
+from .throttle import ProviderThrottle
+
+logger = logging.getLogger(__name__)
+
+
+# Pooled keep-alive HTTP session for the local LM Studio server
+_lm_session = requests.Session()
+_lm_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+)
+_lm_session.mount('http://', _lm_adapter)
+_lm_session.mount('https://', _lm_adapter)
+
+# Keyword sets for the rule-based context analysis and priority calculation
+POSITIVE_WORDS = frozenset({'good', 'great', 'excellent', 'amazing', 'wonderful'})
+NEGATIVE_WORDS = frozenset({'bad', 'terrible', 'urgent', 'critical', 'emergency'})
+URGENT_WORDS = frozenset({'urgent', 'asap', 'immediately', 'critical', 'emergency'})
+PRIORITY_URGENT_WORDS = frozenset({'urgent', 'asap', 'critical', 'important', 'priority', 'deadline', 'emergency'})
+WORD_RE = re.compile(r'\w+')
+TASK_PATTERN_RE = re.compile(r'\b(?:need to|should|must|have to|remember to)\b[^.]*', re.IGNORECASE)
+
+# Lifetime of exact-match provider responses in the Django cache (seconds)
+RESPONSE_CACHE_TIMEOUT = 3600
+
+# Most provider calls a single batch runs at once
+BATCH_MAX_CONCURRENCY = 5
+
+# Static instructions are sent as byte-identical system messages ahead of the
+# per-request input so providers can reuse their cached prompt prefix.
+CONTEXT_SYSTEM_PROMPT = """Analyze the daily context content given by the user (an email, message, note or other source) and extract insights.
+
+Please provide a JSON response with the following structure:
+{
+    "keywords": ["keyword1", "keyword2", "keyword3"],
+    "sentiment": "positive|neutral|negative",
+    "urgency": 0.0-1.0,
+    "extracted_tasks": ["task1", "task2"],
+    "insights": "Brief analysis of the content"
+}
+
+Focus on:
+1. Extracting relevant keywords
+2. Determining sentiment
+3. Assessing urgency level
+4. Identifying potential tasks
+5. Providing actionable insights
+"""
+
+TASK_SCHEDULE_SYSTEM_PROMPT = """Suggest a deadline and priority for the task given by the user.
+
+Please provide a JSON response with the following structure:
+{
+    "suggested_deadline": "YYYY-MM-DD",
+    "priority_score": 0.0-1.0,
+    "suggested_priority": "urgent|high|medium|low",
+    "reasoning": "explanation of suggestions"
+}
+
+Consider:
+1. Task complexity and estimated time
+2. Current workload and context
+3. Urgency indicators from context
+4. Optimal deadline based on priority
+"""
+
+TASK_CATEGORY_SYSTEM_PROMPT = """Suggest the most appropriate category for the task given by the user.
+
+Please provide a JSON response with the following structure:
+{
+    "suggested_category": "category_name"
+}
+"""
+
+TASK_ENHANCEMENT_SYSTEM_PROMPT = """Enhance the description of the task given by the user using its recent context.
+
+Please provide a JSON response with the following structure:
+{
+    "enhanced_description": "enhanced description with context",
+    "extracted_tasks": ["subtask1", "subtask2"]
+}
+"""
+
+PRIORITY_SYSTEM_PROMPT = """Analyze the task given by the user and calculate a priority score (0.0 to 1.0) based on:
+1. Task title and description
+2. Deadline proximity
+3. Context urgency and sentiment
+4. Overall importance indicators
+
+Consider:
+- Urgency keywords (urgent, asap, critical, important, deadline)
+- Deadline proximity (days until deadline)
+- Context urgency levels
+- Sentiment analysis from context
+- Task complexity and scope
+
+Return only a JSON response with this structure:
+{
+    "priority_score": 0.85,
+    "reasoning": "High priority due to urgent deadline and critical keywords in description"
+}
+"""
+
+# Per-request user messages, compiled once at import and filled with substitute()
+CONTEXT_PROMPT_TEMPLATE = Template("$source_type: $content")
+
+TASK_PROMPT_TEMPLATE = Template("""Task Title: $title
+Task Description: $description
+
+Recent Context:
+$context_summary""")
+
+PRIORITY_PROMPT_TEMPLATE = Template("""Task Title: $title
+Task Description: $description
+Deadline: $deadline
+
+Recent Context Insights:
+$context_insights""")
+
+
+class JsonObjectScanner:
+    """
+    Finds the first complete JSON object in text fed to it piece by piece.
+    Quotes are tracked from the opening brace on, so braces and escaped quotes
+    inside string values do not end the object.
+    """
+    
+    def __init__(self):
+        self._chunks = []
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._position = 0
+    
+    @property
+    def text(self) -> str:
+        """All text fed so far"""
+        return ''.join(self._chunks)
+    
+    def feed(self, text: str) -> Optional[str]:
+        """Add the next piece of text, returning the JSON object once it closes"""
+        self._chunks.append(text)
+        for char in text:
+            self._position += 1
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"' and self._start is not None:
+                self._in_string = True
+            elif char == '{':
+                if self._start is None:
+                    self._start = self._position - 1
+                self._depth += 1
+            elif char == '}' and self._start is not None:
+                self._depth -= 1
+                if self._depth == 0:
+                    return self.text[self._start:self._position]
+        return None
+
+
+def extract_json_object(text: str) -> str:
+    """The first JSON object in a complete response, or the whole text if it has none"""
+    return JsonObjectScanner().feed(text) or text
 
 
 class AIService:
@@ -22,21 +204,27 @@ class AIService:
     def __init__(self):
         self.config = settings.AI_SERVICE_CONFIG
         self.default_provider = self.config.get('DEFAULT_AI_PROVIDER', 'openai')
+        self.semantic_cache = get_semantic_cache()
         
         # Initialize AI clients
         self._setup_ai_clients()
     
     def _setup_ai_clients(self):
         """Setup AI service clients based on configuration"""
-        # Initialize LangChain clients
+        # Initialize LangChain clients. Provider SDKs are imported only when
+        # their API key is configured, keeping unused SDKs out of worker memory.
         self.openai_client = None
         self.claude_client = None
         self.gemini_client = None
         
+        # Model parameters of the configured clients, used to namespace cache keys
+        self.cache_namespace = ''
+        
         # OpenAI
         if (self.config.get('OPENAI_API_KEY') and 
             self.config.get('OPENAI_API_KEY') != 'your-openai-api-key-here'):
             try:
+                from langchain_openai import ChatOpenAI
                 self.openai_client = ChatOpenAI(
                     api_key=self.config['OPENAI_API_KEY'],
                     model="gpt-3.5-turbo",
@@ -44,13 +232,14 @@ class AIService:
                     max_tokens=500
                 )
             except Exception as e:
-                print(f"Failed to initialize OpenAI client: {e}")
+                logger.warning("Failed to initialize OpenAI client: %s", e)
                 self.openai_client = None
         
         # Anthropic Claude
         if (self.config.get('ANTHROPIC_API_KEY') and 
             self.config.get('ANTHROPIC_API_KEY') != 'your-anthropic-api-key-here'):
             try:
+                from langchain_anthropic import ChatAnthropic
                 self.claude_client = ChatAnthropic(
                     api_key=self.config['ANTHROPIC_API_KEY'],
                     model="claude-3-sonnet-20240229",
@@ -58,94 +247,253 @@ class AIService:
                     max_tokens=500
                 )
             except Exception as e:
-                print(f"Failed to initialize Anthropic client: {e}")
+                logger.warning("Failed to initialize Anthropic client: %s", e)
                 self.claude_client = None
         
         # Google Gemini
         if (self.config.get('GOOGLE_API_KEY') and 
             self.config.get('GOOGLE_API_KEY') != 'your-google-api-key-here'):
             try:
+                from langchain_google_genai import ChatGoogleGenerativeAI
                 self.gemini_client = ChatGoogleGenerativeAI(
                     google_api_key=self.config['GOOGLE_API_KEY'],
                     model="gemini-1.5-flash",
+                    convert_system_message_to_human=True,
                     temperature=0.7,
                     max_tokens=500
                 )
             except Exception as e:
-                print(f"Failed to initialize Gemini client: {e}")
+                logger.warning("Failed to initialize Gemini client: %s", e)
                 self.gemini_client = None
+        
+        models = []
+        if self.openai_client:
+            models.append('openai:gpt-3.5-turbo')
+        if self.gemini_client:
+            models.append('gemini:gemini-1.5-flash')
+        self.cache_namespace = '|'.join(models) + '|temperature=0.7|max_tokens=500'
+        
+        # Queue provider calls in-process below the providers' rate limits
+        self.openai_throttle = ProviderThrottle(
+            max_concurrency=self.config.get('OPENAI_MAX_CONCURRENCY', 20),
+            requests_per_minute=self.config.get('OPENAI_REQUESTS_PER_MINUTE', 3500)
+        )
+        self.gemini_throttle = ProviderThrottle(
+            max_concurrency=self.config.get('GEMINI_MAX_CONCURRENCY', 20),
+            requests_per_minute=self.config.get('GEMINI_REQUESTS_PER_MINUTE', 1000)
+        )
     
-    def _call_ai_provider(self, prompt: str, provider: str = None) -> str:
-        """Call the specified AI provider with a prompt"""
+    def _messages(self, prompt: str, system_prompt: str = None) -> List:
+        """Build the chat messages: static system instructions first, dynamic input last"""
+        messages = [SystemMessage(content=system_prompt)] if system_prompt else []
+        messages.append(HumanMessage(content=prompt))
+        return messages
+    
+    def _cache_scope(self, system_prompt: str = None) -> str:
+        """Cache namespace for the configured model parameters and system prompt"""
+        return f"{self.cache_namespace}\n{system_prompt or ''}"
+    
+    def _response_cache_key(self, prompt: str, system_prompt: str = None) -> str:
+        """Exact-match cache key for a prompt and the configured model parameters"""
+        return 'ai:' + hashlib.sha256(
+            f"{self._cache_scope(system_prompt)}\n{prompt}".encode('utf-8')
+        ).hexdigest()
+    
+    def _cached_batch_call(self, prompts: List[str], system_prompt: str = None) -> List[str]:
+        """Call the AI provider for several prompts in one concurrent batch"""
+        keys = [self._response_cache_key(prompt, system_prompt) for prompt in prompts]
+        
+        try:
+            cached = cache.get_many(keys)
+        except Exception as e:
+            logger.warning("Response cache lookup failed: %s", e)
+            cached = {}
+        
+        responses = [cached.get(key) for key in keys]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        if not missing:
+            return responses
+        
+        # Priority order: OpenAI → Google Gemini → Simulated Response
+        providers = (
+            ('OpenAI', self.openai_client, self.openai_throttle),
+            ('Google Gemini', self.gemini_client, self.gemini_throttle),
+        )
+        for client_name, client, throttle in providers:
+            if not client or not missing:
+                continue
+            try:
+                # Every prompt in flight holds a concurrency slot, and each uses a rate slot
+                with throttle.reserve(min(BATCH_MAX_CONCURRENCY, len(missing)), len(missing)) as concurrency:
+                    results = client.batch(
+                        [self._messages(prompts[i], system_prompt) for i in missing],
+                        config={'max_concurrency': concurrency},
+                        return_exceptions=True
+                    )
+            except Exception as e:
+                logger.warning("%s batch failed: %s", client_name, e)
+                continue
+            
+            fresh = {}
+            for i, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    logger.warning("%s batch item failed: %s", client_name, result)
+                    continue
+                # Same extraction as streamed single calls, for prose- or fence-wrapped JSON
+                responses[i] = fresh[keys[i]] = extract_json_object(result.content)
+            missing = [i for i in missing if responses[i] is None]
+            
+            try:
+                cache.set_many(fresh, timeout=RESPONSE_CACHE_TIMEOUT)
+            except Exception as e:
+                logger.warning("Response cache store failed: %s", e)
+        
+        # Simulated responses are never cached
+        for i in missing:
+            responses[i] = self._simulate_ai_response(f"{system_prompt or ''}\n{prompts[i]}")
+        return responses
+    
+    def _cached_call(self, prompt: str, provider: str = None, system_prompt: str = None,
+                     semantic_text: str = None) -> str:
+        """
+        Call the AI provider, reusing the response of an identical prompt.
+        semantic_text is the request-specific part of the prompt that near-duplicate
+        lookups compare; without it only identical prompts are reused.
+        """
+        key = self._response_cache_key(prompt, system_prompt)
+        
+        try:
+            response = cache.get(key)
+            if response is not None:
+                return response
+        except Exception as e:
+            logger.warning("Response cache lookup failed: %s", e)
+        
+        response = self._call_ai_provider(prompt, provider, system_prompt, semantic_text)
+        if response is None:
+            # Simulated responses are never cached
+            return self._simulate_ai_response(f"{system_prompt or ''}\n{prompt}")
+        
+        try:
+            cache.set(key, response, timeout=RESPONSE_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning("Response cache store failed: %s", e)
+        return response
+    
+    def _call_ai_provider(self, prompt: str, provider: str = None, system_prompt: str = None,
+                          semantic_text: str = None) -> Optional[str]:
+        """Call the specified AI provider with a prompt, None if no provider answered"""
         provider = provider or self.default_provider
+        scope = self._cache_scope(system_prompt)
+        
+        embedding = None
+        if semantic_text:
+            try:
+                # Reuse the response of a near-identical request
+                cached, embedding = self.semantic_cache.lookup(prompt, scope, semantic_text)
+                if cached is not None:
+                    return cached
+            except Exception as e:
+                logger.warning("Semantic cache lookup failed: %s", e)
         
         try:
             # Priority order: OpenAI → Google Gemini → Simulated Response
+            response = None
             
             # 1. Try OpenAI first (most reliable)
             if self.openai_client:
                 try:
-                    return self._call_openai(prompt)
+                    response = self._call_openai(prompt, system_prompt)
                 except Exception as e:
-                    print(f"OpenAI failed: {e}, trying Google Gemini...")
+                    logger.warning("OpenAI failed: %s, trying Google Gemini...", e)
             
             # 2. Try Google Gemini as fallback
-            if self.gemini_client:
+            if response is None and self.gemini_client:
                 try:
-                    return self._call_gemini(prompt)
+                    response = self._call_gemini(prompt, system_prompt)
                 except Exception as e:
-                    print(f"Google Gemini failed: {e}, using simulated response...")
+                    logger.warning("Google Gemini failed: %s, using simulated response...", e)
             
-            # 3. Fallback to simulated AI response
-            return self._simulate_ai_response(prompt)
+            # 3. Caller falls back to a simulated AI response
+            if response is None:
+                return None
             
         except Exception as e:
-            print(f"AI provider {provider} failed: {str(e)}")
-            return self._simulate_ai_response(prompt)
+            logger.warning("AI provider %s failed: %s", provider, e)
+            return None
+        
+        if semantic_text:
+            try:
+                self.semantic_cache.set(prompt, response, scope, semantic_text, embedding)
+            except Exception as e:
+                logger.warning("Semantic cache store failed: %s", e)
+        return response
     
-    def _call_openai(self, prompt: str) -> str:
+    def _stream_json_response(self, client, messages: List) -> str:
+        """
+        Stream a chat completion and stop reading once the first JSON object closes.
+        
+        Every prompt asks for a JSON object, so any text generated after its
+        closing brace is discarded without waiting for it. Returns the JSON
+        object alone, or the full text if the response contains no object.
+        """
+        scanner = JsonObjectScanner()
+        stream = client.stream(messages)
+        try:
+            for chunk in stream:
+                json_object = scanner.feed(chunk.content)
+                if json_object is not None:
+                    return json_object
+        finally:
+            # Closing the generator closes the HTTP stream, cancelling the remaining tokens
+            stream.close()
+        
+        return scanner.text
+    
+    def _call_openai(self, prompt: str, system_prompt: str = None) -> str:
         """Call OpenAI API using LangChain"""
         if not self.openai_client:
             raise Exception("OpenAI client not initialized")
         
-        response = self.openai_client.invoke([HumanMessage(content=prompt)])
-        return response.content
+        with self.openai_throttle:
+            return self._stream_json_response(self.openai_client, self._messages(prompt, system_prompt))
     
-    def _call_claude(self, prompt: str) -> str:
+    def _call_claude(self, prompt: str, system_prompt: str = None) -> str:
         """Call Anthropic Claude API using LangChain"""
         if not self.claude_client:
-            return self._simulate_ai_response(prompt)
+            return self._simulate_ai_response(f"{system_prompt or ''}\n{prompt}")
         
         try:
-            response = self.claude_client.invoke([HumanMessage(content=prompt)])
-            return response.content
+            return self._stream_json_response(self.claude_client, self._messages(prompt, system_prompt))
         except Exception as e:
-            print(f"Claude API call failed: {e}")
-            return self._simulate_ai_response(prompt)
+            logger.warning("Claude API call failed: %s", e)
+            return self._simulate_ai_response(f"{system_prompt or ''}\n{prompt}")
     
-    def _call_gemini(self, prompt: str) -> str:
+    def _call_gemini(self, prompt: str, system_prompt: str = None) -> str:
         """Call Google Gemini API using LangChain"""
         if not self.gemini_client:
             raise Exception("Gemini client not initialized")
         
         try:
-            response = self.gemini_client.invoke([HumanMessage(content=prompt)])
-            return response.content
+            with self.gemini_throttle:
+                return self._stream_json_response(self.gemini_client, self._messages(prompt, system_prompt))
         except Exception as e:
-            print(f"Gemini API call failed: {e}")
+            logger.warning("Gemini API call failed: %s", e)
             raise e
     
-    def _call_lm_studio(self, prompt: str) -> str:
+    def _call_lm_studio(self, prompt: str, system_prompt: str = None) -> str:
         """Call local LM Studio API"""
         url = self.config.get('LM_STUDIO_URL', 'http://localhost:1234/v1')
-        response = requests.post(
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        response = _lm_session.post(
             f"{url}/chat/completions",
             json={
-                "messages": [{"role": "user", "content": prompt}],
+                "messages": messages,
                 "temperature": 0.7,
                 "max_tokens": 500
             },
-            timeout=30
+            timeout=(3.05, 30)  # Fail fast on connect, allow slow generation
         )
         return response.json()['choices'][0]['message']['content']
     
@@ -172,56 +520,36 @@ class AIService:
         Returns:
             Dictionary with processed insights
         """
-        prompt = f"""
-        Analyze the following {source_type} content and extract insights:
-        
-        Content: {content}
-        
-        Please provide a JSON response with the following structure:
-        {{
-            "keywords": ["keyword1", "keyword2", "keyword3"],
-            "sentiment": "positive|neutral|negative",
-            "urgency": 0.0-1.0,
-            "extracted_tasks": ["task1", "task2"],
-            "insights": "Brief analysis of the content"
-        }}
-        
-        Focus on:
-        1. Extracting relevant keywords
-        2. Determining sentiment
-        3. Assessing urgency level
-        4. Identifying potential tasks
-        5. Providing actionable insights
-        """
+        prompt = CONTEXT_PROMPT_TEMPLATE.substitute(source_type=source_type, content=content)
         
         try:
-            ai_response = self._call_ai_provider(prompt)
+            ai_response = self._cached_call(prompt, system_prompt=CONTEXT_SYSTEM_PROMPT, semantic_text=prompt)
             
             # Try to parse JSON response
             try:
-                insights = json.loads(ai_response)
-            except json.JSONDecodeError:
+                insights = orjson.loads(ai_response)
+            except orjson.JSONDecodeError:
                 # Fallback to basic analysis
                 insights = self._basic_context_analysis(content, source_type)
             
             return insights
             
         except Exception as e:
-            print(f"Context processing failed: {str(e)}")
+            logger.warning("Context processing failed: %s", e)
             return self._basic_context_analysis(content, source_type)
     
     def _basic_context_analysis(self, content: str, source_type: str) -> Dict[str, Any]:
         """Basic context analysis as fallback"""
+        # Tokenize once and count every word
+        words = WORD_RE.findall(content.lower())
+        word_counts = Counter(words)
+        
         # Extract keywords
-        words = content.lower().split()
-        keywords = [word for word in words if len(word) > 3][:5]
+        keywords = list(islice((word for word in words if len(word) > 3), 5))
         
         # Simple sentiment analysis
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful']
-        negative_words = ['bad', 'terrible', 'urgent', 'critical', 'emergency']
-        
-        positive_count = sum(1 for word in words if word in positive_words)
-        negative_count = sum(1 for word in words if word in negative_words)
+        positive_count = sum(word_counts[word] for word in POSITIVE_WORDS)
+        negative_count = sum(word_counts[word] for word in NEGATIVE_WORDS)
         
         if negative_count > positive_count:
             sentiment = 'negative'
@@ -231,28 +559,21 @@ class AIService:
             sentiment = 'neutral'
         
         # Urgency calculation
-        urgent_words = ['urgent', 'asap', 'immediately', 'critical', 'emergency']
-        urgency = min(sum(1 for word in words if word in urgent_words) / len(words) * 2, 1.0)
-        
-        # Extract potential tasks
-        task_patterns = ['need to', 'should', 'must', 'have to', 'remember to']
-        extracted_tasks = []
-        for pattern in task_patterns:
-            if pattern in content.lower():
-                # Simple task extraction
-                start = content.lower().find(pattern)
-                end = content.find('.', start)
-                if end == -1:
-                    end = len(content)
-                task = content[start:end].strip()
-                if len(task) < 100:
-                    extracted_tasks.append(task)
+        urgent_count = sum(word_counts[word] for word in URGENT_WORDS)
+        urgency = min(urgent_count / len(words) * 2, 1.0) if words else 0.0
+        
+        # Extract potential tasks: each match runs from the pattern to the end of its sentence
+        extracted_tasks = list(islice(
+            (task for task in (match.group(0).strip() for match in TASK_PATTERN_RE.finditer(content))
+             if len(task) < 100),
+            3
+        ))
         
         return {
             'keywords': keywords,
             'sentiment': sentiment,
             'urgency': urgency,
-            'extracted_tasks': extracted_tasks[:3],
+            'extracted_tasks': extracted_tasks,
             'insights': f"Processed {source_type} content with {len(keywords)} keywords and {sentiment} sentiment."
         }
     
@@ -263,7 +584,7 @@ class AIService:
         Args:
             title: Task title
             description: Task description
-            contexts: List of context entries for analysis
+            contexts: Recent context entries as returned by get_recent_contexts()
         
         Returns:
             Dictionary with AI suggestions
@@ -273,51 +594,49 @@ class AIService:
         if contexts:
             recent_contexts = contexts[:5]  # Use recent contexts
             context_summary = "\n".join([
-                f"{ctx.source_type}: {ctx.content[:100]}..." 
+                f"{ctx['source_type']}: {ctx['content_excerpt']}..." 
                 for ctx in recent_contexts
             ])
         
-        prompt = f"""
-        Analyze the following task and provide intelligent suggestions:
-        
-        Task Title: {title}
-        Task Description: {description}
-        
-        Recent Context:
-        {context_summary}
-        
-        Please provide a JSON response with the following structure:
-        {{
-            "suggested_deadline": "YYYY-MM-DD",
-            "suggested_category": "category_name",
-            "enhanced_description": "enhanced description with context",
-            "reasoning": "explanation of suggestions",
-            "priority_score": 0.0-1.0,
-            "suggested_priority": "urgent|high|medium|low",
-            "extracted_tasks": ["subtask1", "subtask2"]
-        }}
-        
-        Consider:
-        1. Task complexity and estimated time
-        2. Current workload and context
-        3. Urgency indicators from context
-        4. Optimal deadline based on priority
-        5. Most appropriate category
-        6. Enhanced description with relevant context
-        """
+        prompt = TASK_PROMPT_TEMPLATE.substitute(
+            title=title,
+            description=description,
+            context_summary=context_summary
+        )
+        
+        # Near-duplicate lookups compare the task itself, not the context shared by every prompt
+        task_text = f"{title}\n{description}"
+        
+        # Independent sub-analyses over the same task, dispatched to the provider concurrently
+        system_prompts = [
+            TASK_SCHEDULE_SYSTEM_PROMPT,
+            TASK_CATEGORY_SYSTEM_PROMPT,
+            TASK_ENHANCEMENT_SYSTEM_PROMPT,
+        ]
         
         try:
-            ai_response = self._call_ai_provider(prompt)
+            with ThreadPoolExecutor(max_workers=len(system_prompts)) as executor:
+                ai_responses = list(executor.map(
+                    lambda system_prompt: self._cached_call(
+                        prompt, system_prompt=system_prompt, semantic_text=task_text
+                    ),
+                    system_prompts
+                ))
             
-            try:
-                suggestions = json.loads(ai_response)
-            except json.JSONDecodeError:
-                suggestions = self._basic_task_suggestions(title, description, contexts)
+            # Start from rule-based suggestions and overlay each parsed sub-analysis
+            suggestions = self._basic_task_suggestions(title, description, contexts)
+            for ai_response in ai_responses:
+                try:
+                    result = orjson.loads(ai_response)
+                except orjson.JSONDecodeError:
+                    continue
+                if isinstance(result, dict):
+                    suggestions.update(result)
             
             return suggestions
             
         except Exception as e:
-            print(f"Task suggestions failed: {str(e)}")
+            logger.warning("Task suggestions failed: %s", e)
             return self._basic_task_suggestions(title, description, contexts)
     
     def _basic_task_suggestions(self, title: str, description: str, contexts: List) -> Dict[str, Any]:
@@ -372,34 +691,35 @@ class AIService:
             'extracted_tasks': []
         }
     
-    def generate_insights(self, tasks: List, contexts: List) -> Dict[str, Any]:
+    def generate_insights(self, tasks, contexts) -> Dict[str, Any]:
         """
         Generate productivity insights and recommendations.
         
         Args:
-            tasks: List of task objects
-            contexts: List of context entries
+            tasks: Task queryset
+            contexts: ContextEntry queryset
         
         Returns:
-            Dictionary with insights and recommendations
+            Dictionary with insights, recommendations and the task counts they are based on
         """
-        # Calculate basic metrics
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == 'completed'])
-        urgent_tasks = len([t for t in tasks if t.priority == 'urgent'])
+        # Calculate basic metrics in a single aggregate query
+        counts = tasks.aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            urgent=Count('id', filter=Q(priority='urgent')),
+        )
+        total_tasks = counts['total']
+        completed_tasks = counts['completed']
+        urgent_tasks = counts['urgent']
         
         productivity = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
         burnout_risk = (urgent_tasks / total_tasks * 100) if total_tasks > 0 else 0
         
-        # Analyze focus areas
-        category_counts = {}
-        for task in tasks:
-            if task.category:
-                category_name = task.category.name if hasattr(task.category, 'name') else str(task.category)
-                category_counts[category_name] = category_counts.get(category_name, 0) + 1
-        
-        focus_areas = sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:3]
-        focus_areas = [area[0] for area in focus_areas]
+        # Analyze focus areas: the three categories with the most tasks
+        category_counts = tasks.filter(category__isnull=False).values('category__name').annotate(
+            task_count=Count('id')
+        ).order_by('-task_count', 'category__name')[:3]
+        focus_areas = [row['category__name'] for row in category_counts]
         
         # Generate recommendations
         recommendations = []
@@ -407,7 +727,8 @@ class AIService:
             recommendations.append("Consider breaking down large tasks into smaller, manageable chunks")
         if burnout_risk > 70:
             recommendations.append("You have many urgent tasks. Try to prioritize and delegate when possible")
-        if len(contexts) < 3:
+        # Only whether there are at least three contexts matters, so fetch at most three ids
+        if len(contexts.values_list('pk', flat=True)[:3]) < 3:
             recommendations.append("Adding more daily context will improve AI suggestions")
         else:
             recommendations.append("Your context input is helping improve task intelligence")
@@ -416,7 +737,10 @@ class AIService:
             'productivity': productivity,
             'burnout': burnout_risk,
             'focus': focus_areas,
-            'recommendations': recommendations
+            'recommendations': recommendations,
+            'total_tasks': total_tasks,
+            'completed_tasks': completed_tasks,
+            'urgent_tasks': urgent_tasks,
         }
     
     def calculate_priority_score(self, task_data: Dict, contexts: List) -> float:
@@ -431,70 +755,85 @@ class AIService:
             Priority score between 0 and 1
         """
         try:
-            # Create AI prompt for priority calculation
-            title = task_data.get('title', '')
-            description = task_data.get('description', '')
-            deadline = task_data.get('deadline', '')
-            
-            # Get context insights
-            context_insights = []
-            if contexts:
-                # Convert to list and get last 3 contexts (Django QuerySet doesn't support negative indexing)
-                contexts_list = list(contexts)
-                recent_contexts = contexts_list[-3:] if len(contexts_list) >= 3 else contexts_list
-                for ctx in recent_contexts:
-                    insights = ctx.processed_insights
-                    if insights:
-                        context_insights.append({
-                            'content': ctx.content[:100],
-                            'urgency': insights.get('urgency', 0),
-                            'sentiment': insights.get('sentiment', 'neutral')
-                        })
-            
-            prompt = f"""
-            Analyze the following task and calculate a priority score (0.0 to 1.0) based on:
-            1. Task title and description
-            2. Deadline proximity
-            3. Context urgency and sentiment
-            4. Overall importance indicators
-            
-            Task Title: {title}
-            Task Description: {description}
-            Deadline: {deadline}
-            
-            Recent Context Insights:
-            {json.dumps(context_insights, indent=2)}
-            
-            Consider:
-            - Urgency keywords (urgent, asap, critical, important, deadline)
-            - Deadline proximity (days until deadline)
-            - Context urgency levels
-            - Sentiment analysis from context
-            - Task complexity and scope
+            prompt = self._priority_prompt(task_data, self._priority_context_insights(contexts))
             
-            Return only a JSON response with this structure:
-            {{
-                "priority_score": 0.85,
-                "reasoning": "High priority due to urgent deadline and critical keywords in description"
-            }}
-            """
-            
-            # Get AI response
-            ai_response = self._call_ai_provider(prompt)
+            # Get AI response, exact matches only: the score hinges on the deadline and context urgency,
+            # which text similarity of the task does not capture
+            ai_response = self._cached_call(prompt, system_prompt=PRIORITY_SYSTEM_PROMPT)
             
             try:
-                result = json.loads(ai_response)
-                priority_score = result.get('priority_score', 0.5)
-                return min(max(float(priority_score), 0.0), 1.0)
-            except (json.JSONDecodeError, ValueError, TypeError):
+                return self._parse_priority_score(ai_response)
+            except (orjson.JSONDecodeError, ValueError, TypeError):
                 # Fallback to rule-based calculation
                 return self._rule_based_priority_calculation(task_data, contexts)
                 
         except Exception as e:
-            print(f"AI priority calculation failed: {str(e)}")
+            logger.warning("AI priority calculation failed: %s", e)
             # Fallback to rule-based calculation
             return self._rule_based_priority_calculation(task_data, contexts)
     
+    def calculate_priority_batch(self, tasks_data: List[Dict], contexts: List) -> List[float]:
+        """
+        Calculate priority scores for several tasks with one batched AI call.
+        
+        Args:
+            tasks_data: List of task information dictionaries
+            contexts: List of context entries
+        
+        Returns:
+            Priority scores between 0 and 1, in the order of tasks_data
+        """
+        try:
+            context_insights = self._priority_context_insights(contexts)
+            prompts = [self._priority_prompt(task_data, context_insights) for task_data in tasks_data]
+            ai_responses = self._cached_batch_call(prompts, system_prompt=PRIORITY_SYSTEM_PROMPT)
+        except Exception as e:
+            logger.warning("AI batch priority calculation failed: %s", e)
+            ai_responses = [None] * len(tasks_data)
+        
+        scores = []
+        for task_data, ai_response in zip(tasks_data, ai_responses):
+            try:
+                scores.append(self._parse_priority_score(ai_response))
+            except (orjson.JSONDecodeError, ValueError, TypeError, AttributeError):
+                # Fallback to rule-based calculation
+                scores.append(self._rule_based_priority_calculation(task_data, contexts))
+        return scores
+    
+    def _priority_context_insights(self, contexts: List) -> List[Dict[str, Any]]:
+        """Summarize the urgency and sentiment of the most recent contexts"""
+        context_insights = []
+        if contexts:
+            # Contexts are ordered newest first, so the first entries are the most recent
+            for ctx in contexts[:3]:
+                insights = ctx['processed_insights']
+                if insights:
+                    context_insights.append({
+                        'content': ctx['content_excerpt'],
+                        'urgency': insights.get('urgency', 0),
+                        'sentiment': insights.get('sentiment', 'neutral')
+                    })
+        return context_insights
+    
+    def _priority_prompt(self, task_data: Dict, context_insights: List[Dict[str, Any]]) -> str:
+        """Create the dynamic part of the priority calculation prompt"""
+        title = task_data.get('title', '')
+        description = task_data.get('description', '')
+        deadline = task_data.get('deadline', '')
+        
+        return PRIORITY_PROMPT_TEMPLATE.substitute(
+            title=title,
+            description=description,
+            deadline=deadline,
+            context_insights=orjson.dumps(context_insights, option=orjson.OPT_INDENT_2).decode()
+        )
+    
+    def _parse_priority_score(self, ai_response: str) -> float:
+        """Extract a clamped priority score from an AI JSON response"""
+        result = orjson.loads(ai_response)
+        priority_score = result.get('priority_score', 0.5)
+        return min(max(float(priority_score), 0.0), 1.0)
+    
     def _rule_based_priority_calculation(self, task_data: Dict, contexts: List) -> float:
         """Rule-based priority calculation as fallback"""
         score = 0.5  # Base score
@@ -502,8 +841,10 @@ class AIService:
         # Deadline factor
         if task_data.get('deadline'):
             try:
-                deadline = datetime.fromisoformat(task_data['deadline'].replace('Z', '+00:00'))
-                days_until_deadline = (deadline - datetime.now()).days
+                deadline = ciso8601.parse_datetime(task_data['deadline'])
+                if timezone.is_naive(deadline):
+                    deadline = timezone.make_aware(deadline)
+                days_until_deadline = (deadline - timezone.now()).days
                 
                 if days_until_deadline <= 1:
                     score += 0.4
@@ -513,25 +854,45 @@ class AIService:
                     score += 0.2
                 else:
                     score += 0.1
-            except:
+            except (ValueError, TypeError):
                 pass
         
         # Context-based urgency
         if contexts:
-            # Convert to list and get last 5 contexts (Django QuerySet doesn't support negative indexing)
-            contexts_list = list(contexts)
-            recent_contexts = contexts_list[-5:] if len(contexts_list) >= 5 else contexts_list
-            avg_urgency = sum(ctx.processed_insights.get('urgency', 0) for ctx in recent_contexts) / len(recent_contexts)
+            # Contexts are ordered newest first, so the first entries are the most recent
+            recent_contexts = contexts[:5]
+            avg_urgency = sum(ctx['processed_insights'].get('urgency', 0) for ctx in recent_contexts) / len(recent_contexts)
             score += avg_urgency * 0.3
         
         # Description keywords
         description = task_data.get('description', '')
         title = task_data.get('title', '')
-        text = f"{title} {description}".lower()
+        words = WORD_RE.findall(f"{title} {description}".lower())
         
-        urgent_keywords = ['urgent', 'asap', 'critical', 'important', 'priority', 'deadline', 'emergency']
-        has_urgent_keywords = any(keyword in text for keyword in urgent_keywords)
+        has_urgent_keywords = not PRIORITY_URGENT_WORDS.isdisjoint(words)
         if has_urgent_keywords:
             score += 0.2
         
         return min(max(score, 0), 1)  # Ensure score is between 0 and 1
+
+
+def get_recent_contexts(limit: int = 10):
+    """
+    Most recent context entries as lightweight dicts for prompt building.
+    Only the first 100 characters of the content are fetched from the database,
+    and the rows are read once (walking the created_at index) into a list so
+    callers can slice and iterate it repeatedly without re-querying.
+    """
+    return list(ContextEntry.objects.order_by('-created_at').annotate(
+        content_excerpt=Substr('content', 1, 100)
+    ).values('source_type', 'content_excerpt', 'processed_insights')[:limit])
+
+
+@lru_cache(maxsize=1)
+def get_ai_service() -> AIService:
+    """
+    Process-wide AIService instance.
+    Built on first use so the LangChain clients and their HTTP connection
+    pools are shared across requests instead of being recreated per call.
+    """
+    return AIService()
@@ -0,0 +1,34 @@
+from celery import shared_task
+
+from tasks.models import ContextEntry, Task
+from .services import get_ai_service, get_recent_contexts
+
+
+@shared_task(rate_limit='100/m')
+def calculate_priority_score(task_data):
+    """Calculate AI-based priority score for a task in a Celery worker"""
+    contexts = get_recent_contexts()
+    return get_ai_service().calculate_priority_score(task_data, contexts)
+
+
+@shared_task(rate_limit='100/m')
+def enrich_task_with_ai(task_id):
+    """Fetch AI suggestions for a saved task and store them on it"""
+    task = Task.objects.get(pk=task_id)
+    task.ai_suggestions = get_ai_service().get_task_suggestions(
+        task.title,
+        task.description,
+        get_recent_contexts()
+    )
+    task.save(update_fields=['ai_suggestions'])
+
+
+@shared_task(rate_limit='100/m')
+def process_context_entry(context_id):
+    """Run AI context analysis for a saved entry and store the insights on it"""
+    context_entry = ContextEntry.objects.get(pk=context_id)
+    context_entry.processed_insights = get_ai_service().process_context(
+        context_entry.content,
+        context_entry.source_type
+    )
+    context_entry.save(update_fields=['processed_insights'])
@@ -0,0 +1,239 @@
+import importlib.util
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase, override_settings
+
+from .semantic_cache import SemanticCache
+from .services import AIService
+from .throttle import ProviderThrottle
+
+
+class FakeChunk:
+    """Streamed message chunk, as yielded by a LangChain chat model"""
+
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeStreamingClient:
+    """Chat client streaming fixed text chunks, recording how many were read"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def stream(self, messages):
+        def generate():
+            try:
+                for text in self.chunks:
+                    self.read += 1
+                    yield FakeChunk(text)
+            finally:
+                self.closed = True
+        return generate()
+
+
+class FakeBatchClient:
+    """Chat client answering batches on a thread pool, tracking the calls in flight"""
+
+    def __init__(self, response='{"priority_score": 0.7}'):
+        self.response = response
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, messages):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        return FakeChunk(self.response)
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        with ThreadPoolExecutor(max_workers=config['max_concurrency']) as executor:
+            return list(executor.map(self.invoke, inputs))
+
+
+class StreamJsonResponseTests(SimpleTestCase):
+    """AIService._stream_json_response"""
+
+    def setUp(self):
+        # The scanner uses no client configuration
+        self.service = AIService.__new__(AIService)
+
+    def stream(self, chunks):
+        client = FakeStreamingClient(chunks)
+        return self.service._stream_json_response(client, []), client
+
+    def test_stops_reading_after_object_closes(self):
+        response, client = self.stream(['{"a": 1}', ' trailing text', ' never read'])
+        self.assertEqual(response, '{"a": 1}')
+        self.assertEqual(client.read, 1)
+        self.assertTrue(client.closed)
+
+    def test_braces_inside_strings(self):
+        response, _ = self.stream(['{"text": "a } b { c"} after'])
+        self.assertEqual(response, '{"text": "a } b { c"}')
+
+    def test_escaped_quotes(self):
+        response, _ = self.stream(['{"text": "say \\"}\\" now"} after'])
+        self.assertEqual(response, '{"text": "say \\"}\\" now"}')
+
+    def test_prose_before_object(self):
+        response, _ = self.stream(['He said "hi" } then {"a": {"b": 2}} Hope it helps'])
+        self.assertEqual(response, '{"a": {"b": 2}}')
+
+    def test_object_split_across_chunks(self):
+        response, client = self.stream(
+            ['Result: {"ke', 'y": "va\\', '"lue"', ', "n": {"x": 1}', '}', ' extra']
+        )
+        self.assertEqual(response, '{"key": "va\\"lue", "n": {"x": 1}}')
+        self.assertEqual(client.read, 5)
+        self.assertTrue(client.closed)
+
+    def test_no_object_returns_full_text(self):
+        response, client = self.stream(['no json', ' here'])
+        self.assertEqual(response, 'no json here')
+        self.assertTrue(client.closed)
+
+
+@mock.patch('ai_service.throttle.time.sleep')
+@mock.patch('ai_service.throttle.time.monotonic', return_value=100.0)
+class ProviderThrottleTests(SimpleTestCase):
+    """ProviderThrottle"""
+
+    def test_spaces_requests_by_rate(self, monotonic, sleep):
+        throttle = ProviderThrottle(max_concurrency=5, requests_per_minute=60)
+        throttle.wait_for_slots()
+        sleep.assert_not_called()
+        throttle.wait_for_slots()
+        sleep.assert_called_once_with(1.0)
+        # A batch reserves one slot per request
+        throttle.wait_for_slots(3)
+        sleep.assert_called_with(2.0)
+        throttle.wait_for_slots()
+        sleep.assert_called_with(5.0)
+
+    def test_unused_slots_are_not_banked(self, monotonic, sleep):
+        throttle = ProviderThrottle(max_concurrency=5, requests_per_minute=60)
+        throttle.wait_for_slots()
+        monotonic.return_value = 200.0
+        throttle.wait_for_slots()
+        throttle.wait_for_slots()
+        sleep.assert_called_once_with(1.0)
+
+    def test_limits_calls_in_flight(self, monotonic, sleep):
+        throttle = ProviderThrottle(max_concurrency=1, requests_per_minute=60)
+        with throttle:
+            self.assertFalse(throttle._semaphore.acquire(blocking=False))
+        self.assertTrue(throttle._semaphore.acquire(blocking=False))
+
+    def test_releases_slot_when_waiting_fails(self, monotonic, sleep):
+        throttle = ProviderThrottle(max_concurrency=1, requests_per_minute=60)
+        with mock.patch.object(throttle, 'wait_for_slots', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                with throttle:
+                    pass
+        self.assertTrue(throttle._semaphore.acquire(blocking=False))
+
+    def test_reserve_caps_and_releases_slots(self, monotonic, sleep):
+        throttle = ProviderThrottle(max_concurrency=2, requests_per_minute=60)
+        with throttle.reserve(5, 5) as concurrency:
+            self.assertEqual(concurrency, 2)
+            self.assertFalse(throttle._semaphore.acquire(blocking=False))
+        sleep.assert_not_called()
+        # The batch used five rate slots
+        throttle.wait_for_slots()
+        sleep.assert_called_once_with(5.0)
+        self.assertTrue(throttle._semaphore.acquire(blocking=False))
+        self.assertTrue(throttle._semaphore.acquire(blocking=False))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CachedBatchCallTests(SimpleTestCase):
+    """AIService._cached_batch_call"""
+
+    def setUp(self):
+        self.client = FakeBatchClient()
+        self.service = AIService.__new__(AIService)
+        self.service.cache_namespace = 'test'
+        self.service.openai_client = self.client
+        self.service.gemini_client = None
+        self.service.openai_throttle = ProviderThrottle(max_concurrency=2, requests_per_minute=600000)
+
+    def test_batch_stays_within_throttle_concurrency(self):
+        responses = self.service._cached_batch_call([f'batch task {i}' for i in range(6)])
+        self.assertEqual(responses, [self.client.response] * 6)
+        self.assertLessEqual(self.client.max_in_flight, 2)
+        # Every slot is released after the batch
+        semaphore = self.service.openai_throttle._semaphore
+        self.assertTrue(semaphore.acquire(blocking=False))
+        self.assertTrue(semaphore.acquire(blocking=False))
+
+    def test_batch_results_are_reduced_to_the_json_object(self):
+        self.client.response = 'Here you go:\n```json\n{"priority_score": 0.9}\n```'
+        responses = self.service._cached_batch_call(['fenced task'])
+        self.assertEqual(responses, ['{"priority_score": 0.9}'])
+        # The extracted object is what gets cached
+        self.assertEqual(self.service._cached_batch_call(['fenced task']), responses)
+
+
+class FakeEmbedder:
+    """Sentence embedder returning a fixed unit vector, counting encodes"""
+
+    instances = 0
+
+    def __init__(self, model_name):
+        FakeEmbedder.instances += 1
+        time.sleep(0.01)
+        self.encodes = 0
+
+    def encode(self, text, normalize_embeddings=True):
+        import numpy as np
+        self.encodes += 1
+        return np.array([1.0, 0.0], dtype=np.float32)
+
+
+class SemanticCacheTests(SimpleTestCase):
+    """SemanticCache"""
+
+    def setUp(self):
+        FakeEmbedder.instances = 0
+        fake_module = types.SimpleNamespace(SentenceTransformer=FakeEmbedder)
+        patcher = mock.patch.dict(sys.modules, {'sentence_transformers': fake_module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = SemanticCache(model_name='fake')
+
+    def test_model_loads_once_across_threads(self):
+        threads = [threading.Thread(target=self.cache._get_embedder) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(FakeEmbedder.instances, 1)
+
+    @skipUnless(importlib.util.find_spec('numpy'), 'numpy is not installed')
+    def test_lookup_embedding_is_reused_by_set(self):
+        self.cache.set('first prompt', 'first response', 'scope', 'first task')
+        embedder = self.cache._get_embedder()
+        embedder.encodes = 0
+
+        response, embedding = self.cache.lookup('second prompt', 'other scope', 'second task')
+        self.assertIsNone(response)
+        self.assertEqual(embedder.encodes, 0)
+
+        response, embedding = self.cache.lookup('second prompt', 'scope', 'second task')
+        self.assertEqual(response, 'first response')
+        self.assertEqual(embedder.encodes, 1)
+
+        self.cache.set('third prompt', 'third response', 'scope', 'third task', embedding)
+        self.assertEqual(embedder.encodes, 1)
@@ -0,0 +1,62 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ProviderThrottle:
+    """
+    Limits the calls in flight to an AI provider and their rate per minute.
+    Excess callers wait in-process instead of bursting into provider 429
+    errors and their retry backoff.
+    """
+
+    def __init__(self, max_concurrency: int = 20, requests_per_minute: int = 3500):
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        # Serializes multi-slot reservations so two batches never deadlock holding part of theirs
+        self._reserve_lock = threading.Lock()
+        self._interval = 60.0 / requests_per_minute
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait_for_slots(self, count: int = 1):
+        """Block until `count` requests fit in the per-minute rate"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next_slot, now)
+            self._next_slot = start + self._interval * count
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
+    @contextmanager
+    def reserve(self, concurrency: int = 1, requests: int = 1):
+        """
+        Hold `concurrency` in-flight slots (at most max_concurrency) and wait for
+        `requests` rate slots. Yields the number of calls that may run at once.
+        """
+        concurrency = max(1, min(concurrency, self.max_concurrency))
+        acquired = 0
+        try:
+            with self._reserve_lock:
+                while acquired < concurrency:
+                    self._semaphore.acquire()
+                    acquired += 1
+            self.wait_for_slots(requests)
+            yield concurrency
+        finally:
+            for _ in range(acquired):
+                self._semaphore.release()
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        try:
+            self.wait_for_slots()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._semaphore.release()
+        return False
@@ -6,4 +6,6 @@ urlpatterns = [
     path('process-context/', views.process_context, name='process_context'),
     path('generate-insights/', views.generate_insights, name='generate_insights'),
     path('calculate-priority/', views.calculate_priority, name='calculate_priority'),
+    path('priority/<str:task_id>/', views.priority_result, name='priority_result'),
+    path('calculate-priority-batch/', views.calculate_priority_batch, name='calculate_priority_batch'),
 ]
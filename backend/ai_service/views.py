@@ -1,9 +1,44 @@
+import logging
+import time
+
+from django.core.cache import cache
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from .services import AIService
+from celery.result import AsyncResult
+from kombu.exceptions import OperationalError
+from .services import get_ai_service, get_recent_contexts
+from .tasks import calculate_priority_score as calculate_priority_score_task
 from tasks.models import ContextEntry
 
+logger = logging.getLogger(__name__)
+
+# Insights are cached per user in time buckets of this many seconds
+INSIGHTS_CACHE_TIMEOUT = 60
+
+# Largest number of tasks scored by one batch request (one AI call each)
+MAX_PRIORITY_BATCH_SIZE = 50
+
+
+def _priority_from_score(priority_score):
+    """Map a priority score to a priority level"""
+    if priority_score >= 0.8:
+        return 'urgent'
+    elif priority_score >= 0.6:
+        return 'high'
+    elif priority_score >= 0.4:
+        return 'medium'
+    return 'low'
+
+
+def _priority_response_data(priority_score):
+    """Response payload for a calculated priority score"""
+    return {
+        'priority_score': priority_score,
+        'priority': _priority_from_score(priority_score),
+        'reasoning': 'Priority calculated based on deadline, context urgency, and task content analysis'
+    }
+
 
 @api_view(['POST'])
 def get_ai_suggestions(request):
@@ -19,9 +54,9 @@ def get_ai_suggestions(request):
             )
         
         # Get recent contexts
-        contexts = ContextEntry.objects.all()[:10]
+        contexts = get_recent_contexts()
         
-        ai_service = AIService()
+        ai_service = get_ai_service()
         suggestions = ai_service.get_task_suggestions(title, description, contexts)
         
         return Response(suggestions)
@@ -46,7 +81,7 @@ def process_context(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        ai_service = AIService()
+        ai_service = get_ai_service()
         insights = ai_service.process_context(content, source_type)
         
         return Response(insights)
@@ -64,11 +99,20 @@ def generate_insights(request):
     try:
         from tasks.models import Task
         
+        cache_key = 'insights:{}:{}'.format(
+            request.user.pk or 'anonymous',
+            int(time.time() // INSIGHTS_CACHE_TIMEOUT)
+        )
+        insights = cache.get(cache_key)
+        if insights is not None:
+            return Response(insights)
+        
         tasks = Task.objects.all()
         contexts = ContextEntry.objects.all()
         
-        ai_service = AIService()
+        ai_service = get_ai_service()
         insights = ai_service.generate_insights(tasks, contexts)
+        cache.set(cache_key, insights, INSIGHTS_CACHE_TIMEOUT)
         
         return Response(insights)
         
@@ -81,7 +125,12 @@ def generate_insights(request):
 
 @api_view(['POST'])
 def calculate_priority(request):
-    """Calculate AI-based priority score for a task"""
+    """
+    Calculate AI-based priority score for a task.
+    With "async": true the calculation is queued on a Celery worker and the
+    response is 202 Accepted with a task_id to poll at priority/<task_id>/.
+    If the broker is unreachable the score is calculated in the request instead.
+    """
     try:
         task_data = request.data.get('task_data', {})
         
@@ -91,30 +140,96 @@ def calculate_priority(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        if request.data.get('async'):
+            try:
+                result = calculate_priority_score_task.delay(task_data)
+                return Response(
+                    {'task_id': result.id, 'status': 'pending'},
+                    status=status.HTTP_202_ACCEPTED
+                )
+            except OperationalError as e:
+                # Broker unreachable: answer synchronously instead
+                logger.warning("Could not queue the priority calculation, running it in the request: %s", e)
+        
         # Get recent contexts for context-aware priority calculation
-        contexts = ContextEntry.objects.all()[:10]
+        contexts = get_recent_contexts()
         
-        ai_service = AIService()
+        ai_service = get_ai_service()
         priority_score = ai_service.calculate_priority_score(task_data, contexts)
         
-        # Map score to priority level
-        if priority_score >= 0.8:
-            priority = 'urgent'
-        elif priority_score >= 0.6:
-            priority = 'high'
-        elif priority_score >= 0.4:
-            priority = 'medium'
-        else:
-            priority = 'low'
-        
-        return Response({
-            'priority_score': priority_score,
-            'priority': priority,
-            'reasoning': f'Priority calculated based on deadline, context urgency, and task content analysis'
-        })
+        return Response(_priority_response_data(priority_score))
         
     except Exception as e:
         return Response(
             {'error': f'Failed to calculate priority: {str(e)}'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+@api_view(['POST'])
+def calculate_priority_batch(request):
+    """Calculate AI-based priority scores for several tasks at once"""
+    try:
+        tasks_data = request.data.get('tasks', [])
+        
+        if not tasks_data or not isinstance(tasks_data, list):
+            return Response(
+                {'error': 'A list of tasks is required'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if len(tasks_data) > MAX_PRIORITY_BATCH_SIZE:
+            return Response(
+                {'error': f'At most {MAX_PRIORITY_BATCH_SIZE} tasks can be scored per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not all(isinstance(task_data, dict) for task_data in tasks_data):
+            return Response(
+                {'error': 'Each task must be an object'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Get recent contexts for context-aware priority calculation
+        contexts = get_recent_contexts()
+        
+        ai_service = get_ai_service()
+        priority_scores = ai_service.calculate_priority_batch(tasks_data, contexts)
+        
+        return Response([
+            _priority_response_data(priority_score)
+            for priority_score in priority_scores
+        ])
+        
+    except Exception as e:
+        return Response(
+            {'error': f'Failed to calculate priorities: {str(e)}'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+def priority_result(request, task_id):
+    """Get the result of a queued priority calculation"""
+    try:
+        result = AsyncResult(task_id)
+        
+        if not result.ready():
+            return Response(
+                {'task_id': task_id, 'status': 'pending'},
+                status=status.HTTP_202_ACCEPTED
+            )
+        
+        if result.failed():
+            return Response(
+                {'error': f'Failed to calculate priority: {result.result}'}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        return Response(_priority_response_data(result.result))
+        
+    except Exception as e:
+        return Response(
+            {'error': f'Failed to get priority result: {str(e)}'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,46 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedConsoleHandler(QueueHandler):
+    """
+    Logging handler that formats records on the calling thread and writes
+    them to stderr from a background QueueListener thread.
+
+    The listener starts on the first record of each process, so children
+    forked after logging was configured (Celery prefork, gunicorn --preload)
+    get their own queue and thread instead of the parent's dead one.
+    """
+
+    def __init__(self):
+        super().__init__(queue.SimpleQueue())
+        self.listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            # The lock may be held by another thread of the parent at fork time
+            os.register_at_fork(after_in_child=self._reset_start_lock)
+
+    def _reset_start_lock(self):
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # Records queued before a fork belong to the parent's listener
+            self.queue = queue.SimpleQueue()
+            self.listener = QueueListener(self.queue, logging.StreamHandler())
+            self.listener.start()
+            atexit.register(self.listener.stop)
+            self._pid = os.getpid()
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
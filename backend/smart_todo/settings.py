@@ -70,6 +70,31 @@ DATABASES = {
     }
 }
 
+# Cache (Redis when REDIS_URL is set, so cached AI responses are shared across workers)
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Celery (queued AI calls); results expire with the AI response cache
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL or 'redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default=CELERY_BROKER_URL)
+CELERY_RESULT_EXPIRES = 3600
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_RESULT_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -123,6 +148,37 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Logging: records are queued and written to the console by a background
+# listener thread, so request threads never block on stream I/O.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'verbose': {
+            'format': '{asctime} {levelname} {name} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'queued_console': {
+            '()': 'smart_todo.log_handlers.QueuedConsoleHandler',
+            'formatter': 'verbose',
+        },
+    },
+    'loggers': {
+        'ai_service': {
+            'handlers': ['queued_console'],
+            'level': config('AI_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+        'tasks': {
+            'handlers': ['queued_console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # AI Service Configuration
 AI_SERVICE_CONFIG = {
     'OPENAI_API_KEY': config('OPENAI_API_KEY', default=''),
@@ -130,4 +186,22 @@ AI_SERVICE_CONFIG = {
     'GOOGLE_API_KEY': config('GOOGLE_API_KEY', default=''),
     'LM_STUDIO_URL': config('LM_STUDIO_URL', default='http://localhost:1234/v1'),
     'DEFAULT_AI_PROVIDER': config('DEFAULT_AI_PROVIDER', default='openai'),
+
+    # Per-process provider throttling (keep below the account's rate limits)
+    'OPENAI_MAX_CONCURRENCY': config('OPENAI_MAX_CONCURRENCY', default=20, cast=int),
+    'OPENAI_REQUESTS_PER_MINUTE': config('OPENAI_REQUESTS_PER_MINUTE', default=3500, cast=int),
+    'GEMINI_MAX_CONCURRENCY': config('GEMINI_MAX_CONCURRENCY', default=20, cast=int),
+    'GEMINI_REQUESTS_PER_MINUTE': config('GEMINI_REQUESTS_PER_MINUTE', default=1000, cast=int),
+
+    # Semantic prompt cache (requires the optional sentence-transformers package)
+    'SEMANTIC_CACHE_ENABLED': config('SEMANTIC_CACHE_ENABLED', default=True, cast=bool),
+    'SEMANTIC_CACHE_THRESHOLD': config('SEMANTIC_CACHE_THRESHOLD', default=0.92, cast=float),
+    'SEMANTIC_CACHE_TTL': config('SEMANTIC_CACHE_TTL', default=3600, cast=int),
+    'SEMANTIC_CACHE_MAX_ENTRIES': config('SEMANTIC_CACHE_MAX_ENTRIES', default=1000, cast=int),
+    # Load the embedding model at startup; set in the gunicorn/Celery worker environment (runserver always does)
+    'SEMANTIC_CACHE_PREWARM': config('SEMANTIC_CACHE_PREWARM', default=False, cast=bool),
+    'EMBEDDING_MODEL': config('EMBEDDING_MODEL', default='sentence-transformers/all-MiniLM-L6-v2'),
+    # int8 ONNX embedding model (requires optimum[onnxruntime]), exported once into EMBEDDING_QUANTIZED_DIR
+    'EMBEDDING_QUANTIZE': config('EMBEDDING_QUANTIZE', default=False, cast=bool),
+    'EMBEDDING_QUANTIZED_DIR': config('EMBEDDING_QUANTIZED_DIR', default=os.path.join(BASE_DIR, 'mini-lm-int8')),
 }
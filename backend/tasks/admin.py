@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.db.models import BooleanField, Case, DurationField, ExpressionWrapper, F, Value, When
+from django.db.models.functions import Now
 from .models import Task, Category, ContextEntry, TaskAnalytics
 
 
@@ -18,14 +20,19 @@ class ContextEntryAdmin(admin.ModelAdmin):
     ordering = ['-created_at']
     readonly_fields = ['processed_insights']
 
-    def content_preview(self, obj):
-        return obj.content[:100] + '...' if len(obj.content) > 100 else obj.content
-    content_preview.short_description = 'Content Preview'
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # The changelist only shows the stored preview, not the full content or insights JSON.
+        # The change view loads every column, so saves still write updated_at.
+        changelist = f'{self.opts.app_label}_{self.opts.model_name}_changelist'
+        if request.resolver_match and request.resolver_match.url_name == changelist:
+            queryset = queryset.only('id', 'source_type', 'content_preview', 'created_at')
+        return queryset
 
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
-    list_display = ['title', 'category', 'priority', 'status', 'deadline', 'is_overdue', 'created_at']
+    list_display = ['title', 'category', 'priority', 'status', 'deadline', 'is_overdue_display', 'created_at']
     list_filter = ['status', 'priority', 'category', 'created_at']
     search_fields = ['title', 'description']
     ordering = ['-priority_score', 'deadline']
@@ -51,6 +58,33 @@ class TaskAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # Compute overdue state in the query instead of per row in Python,
+        # and leave the JSON columns out of the changelist rows
+        return super().get_queryset(request).select_related('category').defer(
+            'ai_suggestions', 'tags'
+        ).annotate(
+            _is_overdue=Case(
+                When(deadline__lt=Now(), status__in=['todo', 'in-progress'], then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField()
+            ),
+            _days_until=ExpressionWrapper(F('deadline') - Now(), output_field=DurationField())
+        )
+
+    def save_model(self, request, obj, form, change):
+        # Only write the columns edited in the form
+        if change:
+            obj.save(update_fields=form.changed_data)
+        else:
+            super().save_model(request, obj, form, change)
+
+    def is_overdue_display(self, obj):
+        return obj._is_overdue
+    is_overdue_display.short_description = 'Is Overdue'
+    is_overdue_display.boolean = True
+    is_overdue_display.admin_order_field = '_is_overdue'
+
 
 @admin.register(TaskAnalytics)
 class TaskAnalyticsAdmin(admin.ModelAdmin):
@@ -0,0 +1,20 @@
+import orjson
+from django.db import models
+from django.db.models.fields.json import KeyTransform
+
+
+class FastJSONField(models.JSONField):
+    """JSONField that decodes values read from the database with orjson"""
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        # Key transforms may already come back as native values
+        if isinstance(expression, KeyTransform) and not isinstance(value, str):
+            return value
+        if self.decoder is not None:
+            return super().from_db_value(value, expression, connection)
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return value
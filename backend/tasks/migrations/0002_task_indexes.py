@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contextentry',
+            index=models.Index(fields=['-created_at'], name='context_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contextentry',
+            index=models.Index(fields=['source_type', '-created_at'], name='context_src_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-priority_score', 'deadline', '-created_at'], name='task_pri_dl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'priority'], name='task_stat_pri_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['deadline'], name='task_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskanalytics',
+            index=models.Index(fields=['-generated_at'], name='analytics_generated_idx'),
+        ),
+    ]
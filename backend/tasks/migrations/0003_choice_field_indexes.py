@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-15 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contextentry',
+            name='source_type',
+            field=models.CharField(choices=[('email', 'Email'), ('message', 'Message'), ('note', 'Note'), ('other', 'Other')], db_index=True, default='note', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=models.CharField(choices=[('urgent', 'Urgent'), ('high', 'High'), ('medium', 'Medium'), ('low', 'Low')], db_index=True, default='medium', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status__in', ['todo', 'in-progress'])), fields=['deadline'], name='task_open_deadline'),
+        ),
+    ]
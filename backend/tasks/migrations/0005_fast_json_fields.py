@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-15 11:30
+
+from django.db import migrations
+import tasks.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_choice_field_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contextentry',
+            name='processed_insights',
+            field=tasks.fields.FastJSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='ai_suggestions',
+            field=tasks.fields.FastJSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='tags',
+            field=tasks.fields.FastJSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='taskanalytics',
+            name='focus_areas',
+            field=tasks.fields.FastJSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='taskanalytics',
+            name='recommendations',
+            field=tasks.fields.FastJSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-15 12:00
+
+from django.db import migrations, models
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.functions import Concat, Length, Substr
+from django.db.models.lookups import GreaterThan
+
+
+def backfill_content_preview(apps, schema_editor):
+    ContextEntry = apps.get_model('tasks', 'ContextEntry')
+    ContextEntry.objects.update(content_preview=Case(
+        When(
+            GreaterThan(Length('content'), 100),
+            then=Concat(Substr('content', 1, 100), Value('...'), output_field=CharField())
+        ),
+        default=F('content'),
+        output_field=CharField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_fast_json_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contextentry',
+            name='content_preview',
+            field=models.CharField(default='', editable=False, max_length=103),
+        ),
+        migrations.RunPython(backfill_content_preview, migrations.RunPython.noop),
+    ]
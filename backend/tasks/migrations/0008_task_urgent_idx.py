@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_contextentry_content_preview'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('priority', 'urgent')), fields=['-priority_score', 'deadline', '-created_at'], name='task_urgent_idx'),
+        ),
+    ]
@@ -1,7 +1,29 @@
+import hashlib
+import re
+from collections import Counter
+from django.core.cache import cache
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 import uuid
 
+from .fields import FastJSONField
+
+# Cache keys of read-mostly API responses, dropped when the underlying rows change
+TASK_STATS_CACHE_KEY = 'task_stats_v1'
+POPULAR_CATEGORIES_CACHE_KEY = 'categories_popular_v1'
+LATEST_ANALYTICS_CACHE_KEY = 'analytics_latest_v1'
+
+# Resolved category references (name or UUID -> id), keyed under a version
+# counter that category renames and deletes bump
+CATEGORY_IDS_VERSION_KEY = 'category_ids_version'
+CATEGORY_ID_CACHE_TIMEOUT = 300
+
+# Canonical UUID text, checked before treating a category reference as an id
+UUID_RE = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
 
 class Category(models.Model):
     """Model for task categories with usage tracking"""
@@ -20,6 +42,67 @@ class Category(models.Model):
         return self.name
 
 
+def ensure_categories(categories):
+    """
+    Insert the given unsaved categories, skipping names that already exist.
+    Returns {name: Category} as stored, including rows created concurrently.
+    """
+    Category.objects.bulk_create(categories, ignore_conflicts=True)
+    return Category.objects.in_bulk([category.name for category in categories], field_name='name')
+
+
+def _category_id_cache_key(ref: str) -> str:
+    """Shared cache key of a category reference, under the current category version"""
+    version = cache.get_or_set(CATEGORY_IDS_VERSION_KEY, 1, timeout=None)
+    return f"category_id:{version}:{hashlib.sha256(ref.encode('utf-8')).hexdigest()}"
+
+
+def get_category_id(name: str, color: str = '#3b82f6') -> uuid.UUID:
+    """Id of the category with this name, creating it on first use"""
+    category, _ = Category.objects.get_or_create(name=name, defaults={'color': color})
+    return category.id
+
+
+def _lookup_category_id(ref: str) -> uuid.UUID:
+    """Id of the category given by UUID or by name, read from the database"""
+    if UUID_RE.fullmatch(ref):
+        category_id = uuid.UUID(ref)
+        if Category.objects.filter(pk=category_id).exists():
+            return category_id
+    return get_category_id(ref)
+
+
+def resolve_category_id(ref: str) -> uuid.UUID:
+    """
+    Id of the category given by UUID or by name, creating named categories on first use.
+    Lookups are kept in the shared cache for a few minutes; renames and deletes
+    bump the version in every process using that cache.
+    """
+    key = _category_id_cache_key(ref)
+    category_id = cache.get(key)
+    if category_id is None:
+        category_id = _lookup_category_id(ref)
+        cache.set(key, category_id, timeout=CATEGORY_ID_CACHE_TIMEOUT)
+    return category_id
+
+
+def forget_category_id(ref: str):
+    """Drop the cached id of a category reference, e.g. after its row was found missing"""
+    cache.delete(_category_id_cache_key(ref))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def _clear_category_id_cache(sender, instance, created=False, **kwargs):
+    # Renames and deletes invalidate every cached reference, in all processes
+    if not created:
+        try:
+            cache.incr(CATEGORY_IDS_VERSION_KEY)
+        except ValueError:
+            cache.set(CATEGORY_IDS_VERSION_KEY, 2, timeout=None)
+    cache.delete(POPULAR_CATEGORIES_CACHE_KEY)
+
+
 class ContextEntry(models.Model):
     """Model for daily context entries (messages, emails, notes)"""
     SOURCE_TYPES = [
@@ -28,13 +111,16 @@ class ContextEntry(models.Model):
         ('note', 'Note'),
         ('other', 'Other'),
     ]
+    SOURCE_VALUES = frozenset(value for value, _ in SOURCE_TYPES)
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     content = models.TextField()
-    source_type = models.CharField(max_length=20, choices=SOURCE_TYPES, default='note')
+    # First 100 characters of content (plus '...' when truncated), kept in sync on save
+    content_preview = models.CharField(max_length=103, editable=False, default='')
+    source_type = models.CharField(max_length=20, choices=SOURCE_TYPES, default='note', db_index=True)
     
     # AI-processed insights stored as JSON
-    processed_insights = models.JSONField(default=dict, blank=True)
+    processed_insights = FastJSONField(default=dict, blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -42,9 +128,36 @@ class ContextEntry(models.Model):
     class Meta:
         verbose_name_plural = "Context Entries"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='context_created_idx'),
+            models.Index(fields=['source_type', '-created_at'], name='context_src_created_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.source_type}: {self.content[:50]}..."
+        # The stored preview starts with the same 50 characters, without loading content
+        preview = self.content_preview or self.content or ''
+        return f"{self.source_type}: {preview[:50]}..."
+
+    @staticmethod
+    def build_preview(content: str) -> str:
+        """Preview stored in content_preview for the given content"""
+        content = content or ''
+        return content[:100] + '...' if len(content) > 100 else content
+
+    def save(self, *args, **kwargs):
+        """
+        Keeps content_preview in sync. As with Task.save, updated_at is added
+        to update_fields whenever they are given.
+        """
+        if 'content' not in self.get_deferred_fields():
+            self.content_preview = self.build_preview(self.content)
+        update_fields = kwargs.get('update_fields')
+        if update_fields:
+            update_fields = {*update_fields, 'updated_at'}
+            if 'content' in update_fields:
+                update_fields.add('content_preview')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
 
 
 class Task(models.Model):
@@ -55,12 +168,15 @@ class Task(models.Model):
         ('medium', 'Medium'),
         ('low', 'Low'),
     ]
+    # Constant-time membership checks for input that bypasses model validation
+    PRIORITY_VALUES = frozenset(value for value, _ in PRIORITY_CHOICES)
 
     STATUS_CHOICES = [
         ('todo', 'To Do'),
         ('in-progress', 'In Progress'),
         ('completed', 'Completed'),
     ]
+    STATUS_VALUES = frozenset(value for value, _ in STATUS_CHOICES)
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=200)
@@ -68,7 +184,7 @@ class Task(models.Model):
     
     # Task categorization and priority
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
-    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='medium')
+    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='medium', db_index=True)
     priority_score = models.FloatField(default=0.5)  # AI-calculated priority score (0-1)
     
     # Timing
@@ -76,26 +192,49 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
-    # Status tracking
+    # Status tracking (filters use task_stat_pri_idx, which leads with status)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='todo')
     
     # AI suggestions stored as JSON
-    ai_suggestions = models.JSONField(default=dict, blank=True)
+    ai_suggestions = FastJSONField(default=dict, blank=True)
     
     # Tags for additional categorization
-    tags = models.JSONField(default=list, blank=True)
+    tags = FastJSONField(default=list, blank=True)
 
     class Meta:
         ordering = ['-priority_score', 'deadline', '-created_at']
+        indexes = [
+            models.Index(fields=['-priority_score', 'deadline', '-created_at'], name='task_pri_dl_idx'),
+            models.Index(fields=['status', 'priority'], name='task_stat_pri_idx'),
+            models.Index(fields=['deadline'], name='task_deadline_idx'),
+            # Overdue lookups only ever concern open tasks
+            models.Index(
+                fields=['deadline'],
+                condition=Q(status__in=['todo', 'in-progress']),
+                name='task_open_deadline'
+            ),
+            # The urgent endpoint lists urgent tasks in the default ordering
+            models.Index(
+                fields=['-priority_score', 'deadline', '-created_at'],
+                condition=Q(priority='urgent'),
+                name='task_urgent_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        # Update category usage frequency when task is saved
-        if self.category:
-            self.category.usage_frequency += 1
-            self.category.save()
+        """
+        Pass update_fields when only some columns changed, so the JSON columns
+        are not rewritten. updated_at is always added to it.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields:
+            kwargs['update_fields'] = {*update_fields, 'updated_at'}
+        # Count category usage once, when the task is first created
+        if self.category_id and self._state.adding:
+            Category.objects.filter(pk=self.category_id).update(usage_frequency=F('usage_frequency') + 1)
         super().save(*args, **kwargs)
 
     @property
@@ -108,12 +247,30 @@ class Task(models.Model):
     @property
     def days_until_deadline(self):
         """Calculate days until deadline"""
+        # Querysets annotated with _days_until (e.g. the admin) computed this in the database
+        delta = getattr(self, '_days_until', None)
+        if delta is not None:
+            return delta.days
         if self.deadline:
             delta = self.deadline - timezone.now()
             return delta.days
         return None
 
 
+def count_category_usage(tasks):
+    """Apply the category usage increments Task.save makes, for tasks inserted with bulk_create"""
+    usage = Counter(task.category_id for task in tasks if task.category_id)
+    for category_id, count in usage.items():
+        Category.objects.filter(pk=category_id).update(usage_frequency=F('usage_frequency') + count)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def _clear_task_stats_cache(sender, **kwargs):
+    # Task creation also bumps category usage, which orders the popular categories
+    cache.delete_many([TASK_STATS_CACHE_KEY, POPULAR_CATEGORIES_CACHE_KEY])
+
+
 class TaskAnalytics(models.Model):
     """Model for storing task analytics and insights"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -121,8 +278,8 @@ class TaskAnalytics(models.Model):
     # Analytics data
     productivity_score = models.FloatField(default=0.0)
     burnout_risk = models.FloatField(default=0.0)
-    focus_areas = models.JSONField(default=list, blank=True)
-    recommendations = models.JSONField(default=list, blank=True)
+    focus_areas = FastJSONField(default=list, blank=True)
+    recommendations = FastJSONField(default=list, blank=True)
     
     # Context for analytics
     total_tasks = models.IntegerField(default=0)
@@ -135,6 +292,15 @@ class TaskAnalytics(models.Model):
     class Meta:
         verbose_name_plural = "Task Analytics"
         ordering = ['-generated_at']
+        indexes = [
+            models.Index(fields=['-generated_at'], name='analytics_generated_idx'),
+        ]
 
     def __str__(self):
         return f"Analytics - {self.generated_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+@receiver(post_save, sender=TaskAnalytics)
+@receiver(post_delete, sender=TaskAnalytics)
+def _clear_latest_analytics_cache(sender, **kwargs):
+    cache.delete(LATEST_ANALYTICS_CACHE_KEY)
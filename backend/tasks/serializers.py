@@ -1,5 +1,45 @@
+import uuid
+from functools import partial
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework import serializers
-from .models import Task, Category, ContextEntry, TaskAnalytics
+from rest_framework.settings import api_settings
+from .models import (
+    Task, Category, ContextEntry, TaskAnalytics, resolve_category_id, forget_category_id,
+    count_category_usage, ensure_categories,
+    TASK_STATS_CACHE_KEY, POPULAR_CATEGORIES_CACHE_KEY, UUID_RE
+)
+
+# Largest number of tasks accepted by one bulk create request
+MAX_BULK_CREATE_SIZE = 500
+
+
+def resolve_category(validated_data, category_ref):
+    """
+    Point validated_data at the category given by UUID or by name.
+    Unknown names are created on first use; lookups are cached by resolve_category_id.
+    """
+    validated_data['category_id'] = resolve_category_id(category_ref)
+
+
+def save_with_category(save, validated_data, category_ref):
+    """
+    Call save(validated_data) with the category given by UUID or by name.
+    A cached id can point at a category deleted since by another process, which
+    fails the foreign key check; the reference is then looked up again, once.
+    """
+    if not category_ref:
+        return save(validated_data)
+    resolve_category(validated_data, category_ref)
+    try:
+        with transaction.atomic():
+            return save(validated_data)
+    except IntegrityError:
+        forget_category_id(category_ref)
+        resolve_category(validated_data, category_ref)
+        return save(validated_data)
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -43,45 +83,18 @@ class TaskSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         category_id = validated_data.pop('category_id', None)
-        if category_id:
-            try:
-                # First try to find by UUID
-                category = Category.objects.get(id=category_id)
-                validated_data['category'] = category
-            except (Category.DoesNotExist, ValueError):
-                # If not found by UUID, try to find by name
-                try:
-                    category = Category.objects.get(name=category_id)
-                    validated_data['category'] = category
-                except Category.DoesNotExist:
-                    # If category doesn't exist, create it
-                    category = Category.objects.create(name=category_id)
-                    validated_data['category'] = category
-        return super().create(validated_data)
+        return save_with_category(super().create, validated_data, category_id)
 
     def update(self, instance, validated_data):
         category_id = validated_data.pop('category_id', None)
-        if category_id:
-            try:
-                # First try to find by UUID
-                category = Category.objects.get(id=category_id)
-                validated_data['category'] = category
-            except (Category.DoesNotExist, ValueError):
-                # If not found by UUID, try to find by name
-                try:
-                    category = Category.objects.get(name=category_id)
-                    validated_data['category'] = category
-                except Category.DoesNotExist:
-                    # If category doesn't exist, create it
-                    category = Category.objects.create(name=category_id)
-                    validated_data['category'] = category
-        return super().update(instance, validated_data)
+        return save_with_category(partial(super().update, instance), validated_data, category_id)
 
 
 class TaskListSerializer(serializers.ModelSerializer):
     """Simplified serializer for task lists"""
-    category_name = serializers.CharField(source='category.name', read_only=True)
-    category_color = serializers.CharField(source='category.color', read_only=True)
+    # null for tasks without a category, as in the values() rows of the list endpoints
+    category_name = serializers.CharField(source='category.name', read_only=True, allow_null=True)
+    category_color = serializers.CharField(source='category.color', read_only=True, allow_null=True)
     is_overdue = serializers.ReadOnlyField()
 
     class Meta:
@@ -105,6 +118,68 @@ class TaskAnalyticsSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'generated_at']
 
 
+class TaskBulkCreateSerializer(serializers.ListSerializer):
+    """Creates a batch of tasks with one category lookup and one bulk INSERT"""
+
+    def to_internal_value(self, data):
+        # Checked before validating each item
+        if isinstance(data, list) and len(data) > MAX_BULK_CREATE_SIZE:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'At most {MAX_BULK_CREATE_SIZE} tasks can be created per request.'
+                ]
+            }, code='max_length')
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        if any(data.get('get_ai_suggestions') for data in attrs):
+            raise serializers.ValidationError(
+                'AI suggestions are not available for bulk creates; create the task on its own.'
+            )
+        return attrs
+
+    def create(self, validated_data):
+        refs = [data.pop('category_id', None) for data in validated_data]
+        
+        # New categories, tasks and usage counts are committed together or not at all
+        with transaction.atomic():
+            categories = self._resolve_categories({ref for ref in refs if ref})
+            
+            tasks = []
+            for data, ref in zip(validated_data, refs):
+                data.pop('get_ai_suggestions', None)
+                self.child.normalize(data)
+                tasks.append(Task(category=categories.get(ref), **data))
+            tasks = Task.objects.bulk_create(tasks, batch_size=500)
+            
+            # bulk_create skips Task.save and its signals, apply their effects once per batch
+            count_category_usage(tasks)
+        cache.delete_many([TASK_STATS_CACHE_KEY, POPULAR_CATEGORIES_CACHE_KEY])
+        
+        return tasks
+
+    @staticmethod
+    def _resolve_categories(refs):
+        """Map each category UUID or name to its Category, creating unknown names"""
+        uuids = {uuid.UUID(ref): ref for ref in refs if UUID_RE.fullmatch(ref)}
+        
+        # Like single creates, a reference is tried as an id first and then as a name
+        by_ref = {}
+        by_name = {}
+        for category in Category.objects.filter(Q(id__in=uuids) | Q(name__in=refs)):
+            by_name[category.name] = category
+            if category.id in uuids:
+                by_ref[uuids[category.id]] = category
+        for ref in refs:
+            if ref not in by_ref and ref in by_name:
+                by_ref[ref] = by_name[ref]
+        
+        missing = [ref for ref in refs if ref not in by_ref]
+        if missing:
+            by_ref.update(ensure_categories([Category(name=name) for name in missing]))
+        return by_ref
+
+
 class TaskCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating tasks with AI suggestions"""
     category_id = serializers.CharField(required=False, allow_null=True, allow_blank=True)
@@ -118,8 +193,17 @@ class TaskCreateSerializer(serializers.ModelSerializer):
             'title', 'description', 'category_id', 'priority', 'priority_score',
             'deadline', 'status', 'tags', 'ai_suggestions', 'get_ai_suggestions'
         ]
+        list_serializer_class = TaskBulkCreateSerializer
 
     def create(self, validated_data):
+        self.normalize(validated_data)
+        
+        # Handle category_id - can be UUID or category name string
+        category_id = validated_data.pop('category_id', None)
+        return save_with_category(super().create, validated_data, category_id)
+
+    def normalize(self, validated_data):
+        """Convert the deadline to an aware datetime and fill JSON defaults"""
         # Convert date to datetime if provided
         deadline = validated_data.get('deadline')
         if deadline:
@@ -139,33 +223,6 @@ class TaskCreateSerializer(serializers.ModelSerializer):
                     datetime.combine(deadline, datetime.min.time())
                 )
         
-        # Handle category_id - can be UUID or category name string
-        category_id = validated_data.pop('category_id', None)
-        if category_id:
-            # Check if it looks like a UUID first
-            import uuid
-            try:
-                uuid.UUID(category_id)
-                # It's a UUID, try to find by ID
-                try:
-                    category = Category.objects.get(id=category_id)
-                    validated_data['category'] = category
-                except Category.DoesNotExist:
-                    pass
-            except ValueError:
-                # Not a UUID, treat as name
-                pass
-            
-            # If we haven't found a category yet, try by name
-            if 'category' not in validated_data:
-                try:
-                    category = Category.objects.get(name=category_id)
-                    validated_data['category'] = category
-                except Category.DoesNotExist:
-                    # If category doesn't exist, create it
-                    category = Category.objects.create(name=category_id)
-                    validated_data['category'] = category
-        
         # Ensure ai_suggestions has a default value
         if 'ai_suggestions' not in validated_data or validated_data['ai_suggestions'] is None:
             validated_data['ai_suggestions'] = {}
@@ -173,8 +230,6 @@ class TaskCreateSerializer(serializers.ModelSerializer):
         # Ensure tags has a default value
         if 'tags' not in validated_data or validated_data['tags'] is None:
             validated_data['tags'] = []
-        
-        return super().create(validated_data)
 
 
 class ContextCreateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,100 @@
+import uuid
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Category, Task
+from .serializers import (
+    MAX_BULK_CREATE_SIZE, TaskBulkCreateSerializer, TaskCreateSerializer, TaskListSerializer
+)
+from .views import task_list_data, task_list_values
+
+
+class ResolveCategoriesTests(TestCase):
+    """TaskBulkCreateSerializer._resolve_categories"""
+
+    def resolve(self, *refs):
+        return TaskBulkCreateSerializer._resolve_categories(set(refs))
+
+    def test_uuid_takes_precedence_over_name(self):
+        target = Category.objects.create(name='Work')
+        # Another category whose name is the first one's id
+        Category.objects.create(name=str(target.id))
+        resolved = self.resolve(str(target.id))
+        self.assertEqual(resolved[str(target.id)], target)
+
+    def test_unknown_uuid_falls_back_to_name(self):
+        ref = str(uuid.uuid4())
+        named = Category.objects.create(name=ref)
+        resolved = self.resolve(ref)
+        self.assertEqual(resolved[ref], named)
+        self.assertEqual(Category.objects.count(), 1)
+
+    def test_unknown_uuid_is_created_as_name(self):
+        ref = str(uuid.uuid4())
+        resolved = self.resolve(ref)
+        self.assertEqual(resolved[ref].name, ref)
+        self.assertEqual(Category.objects.count(), 1)
+
+    def test_names_resolve_and_unknown_names_are_created(self):
+        work = Category.objects.create(name='Work')
+        resolved = self.resolve('Work', 'Garden')
+        self.assertEqual(resolved['Work'], work)
+        self.assertEqual(resolved['Garden'], Category.objects.get(name='Garden'))
+        self.assertEqual(Category.objects.count(), 2)
+
+    def test_bulk_create_counts_category_usage(self):
+        work = Category.objects.create(name='Work')
+        serializer = TaskCreateSerializer(data=[
+            {'title': 'By id', 'category_id': str(work.id)},
+            {'title': 'By name', 'category_id': 'Work'},
+            {'title': 'New category', 'category_id': 'Garden'},
+            {'title': 'No category'},
+        ], many=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        work.refresh_from_db()
+        self.assertEqual(work.usage_frequency, 2)
+        self.assertEqual(Category.objects.get(name='Garden').usage_frequency, 1)
+        self.assertEqual(Task.objects.filter(category__isnull=True).count(), 1)
+
+    def test_bulk_create_rejects_ai_suggestions(self):
+        serializer = TaskCreateSerializer(data=[
+            {'title': 'Plain'},
+            {'title': 'Enriched', 'get_ai_suggestions': True},
+        ], many=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('non_field_errors', serializer.errors)
+
+    def test_bulk_create_size_limit(self):
+        data = [{'title': f'Task {i}'} for i in range(MAX_BULK_CREATE_SIZE + 1)]
+        serializer = TaskCreateSerializer(data=data, many=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('non_field_errors', serializer.errors)
+        self.assertFalse(Task.objects.exists())
+
+
+class TaskListDataTests(TestCase):
+    """task_list_data against TaskListSerializer"""
+
+    def test_matches_task_list_serializer(self):
+        work = Category.objects.create(name='Work', color='#123456')
+        now = timezone.now()
+        Task.objects.create(
+            title='Overdue', description='With a category', category=work,
+            priority='urgent', priority_score=0.9, deadline=now - timedelta(days=2)
+        )
+        Task.objects.create(title='No category or deadline', priority='low', priority_score=0.2)
+        Task.objects.create(
+            title='Completed', status='completed', priority_score=0.5,
+            deadline=now - timedelta(days=1)
+        )
+        Task.objects.create(title='Upcoming', category=work, deadline=now + timedelta(days=3))
+
+        queryset = Task.objects.select_related('category').order_by('created_at')
+        expected = [dict(item) for item in TaskListSerializer(queryset, many=True).data]
+        self.assertEqual(task_list_data(task_list_values(queryset)), expected)
+        self.assertIsNone(expected[1]['category_name'])
+        self.assertEqual([item['is_overdue'] for item in expected], [True, False, False, False])
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TaskViewSet, CategoryViewSet, ContextEntryViewSet, TaskAnalyticsViewSet
+from .views import TaskViewSet, CategoryViewSet, ContextEntryViewSet, TaskAnalyticsViewSet, task_stats
 
 # Create router and register viewsets
 router = DefaultRouter()
@@ -10,5 +10,7 @@ router.register(r'contexts', ContextEntryViewSet, basename='context')
 router.register(r'analytics', TaskAnalyticsViewSet, basename='analytics')
 
 urlpatterns = [
+    # Polled by the dashboard, served without the viewset machinery (listed before the router)
+    path('tasks/stats/', task_stats, name='task-stats'),
     path('', include(router.urls)),
 ]
@@ -1,18 +1,132 @@
-from rest_framework import viewsets, status, filters
+import logging
+
+from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from django.db.models import Q, Count
 from django.utils import timezone
 from datetime import timedelta
+from kombu.exceptions import OperationalError
 
-from .models import Task, Category, ContextEntry, TaskAnalytics
+from .models import (
+    Task, Category, ContextEntry, TaskAnalytics,
+    TASK_STATS_CACHE_KEY, POPULAR_CATEGORIES_CACHE_KEY, LATEST_ANALYTICS_CACHE_KEY
+)
 from .serializers import (
     TaskSerializer, TaskListSerializer, CategorySerializer, ContextEntrySerializer,
     TaskAnalyticsSerializer, TaskCreateSerializer, ContextCreateSerializer,
-    AISuggestionsSerializer, TaskStatsSerializer
+    AISuggestionsSerializer
+)
+from ai_service.services import get_ai_service, get_recent_contexts
+from ai_service.tasks import enrich_task_with_ai, process_context_entry
+
+logger = logging.getLogger(__name__)
+
+# Dashboards poll stats, a short TTL keeps it cheap while task writes invalidate it
+STATS_CACHE_TIMEOUT = 30
+# Popular categories and latest analytics change rarely and are invalidated on write
+READ_CACHE_TIMEOUT = 60
+
+
+def queue_ai_job(job, object_id):
+    """Queue a Celery AI job for a saved object, returning its id or None if the broker is unreachable"""
+    try:
+        return job.delay(str(object_id)).id
+    except OperationalError as e:
+        logger.warning("Could not queue %s, running it in the request: %s", job.name, e)
+        return None
+
+
+def compute_task_stats():
+    """Task counts and derived scores for the stats endpoint"""
+    # All counts in a single aggregate query
+    counts = Task.objects.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+        in_progress=Count('id', filter=Q(status='in-progress')),
+        overdue=Count('id', filter=Q(deadline__lt=timezone.now(), status__in=['todo', 'in-progress'])),
+        urgent=Count('id', filter=Q(priority='urgent')),
+    )
+    total_tasks = counts['total']
+    completed_tasks = counts['completed']
+    in_progress_tasks = counts['in_progress']
+    overdue_tasks = counts['overdue']
+    urgent_tasks = counts['urgent']
+    
+    # Calculate productivity score
+    productivity_score = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    
+    # Calculate burnout risk
+    burnout_risk = (urgent_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    
+    return {
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'in_progress_tasks': in_progress_tasks,
+        'overdue_tasks': overdue_tasks,
+        'urgent_tasks': urgent_tasks,
+        'productivity_score': productivity_score,
+        'burnout_risk': burnout_risk,
+    }
+
+
+def get_task_stats():
+    """
+    Cached task stats. The counts and scores are computed here, so they need no
+    serializer validation (TaskStatsSerializer documents the response shape).
+    """
+    return cache.get_or_set(TASK_STATS_CACHE_KEY, compute_task_stats, STATS_CACHE_TIMEOUT)
+
+
+@require_GET
+def task_stats(request):
+    """
+    GET /tasks/stats/ as a plain Django view. Dashboards poll it, so it skips
+    DRF's viewset dispatch, content negotiation and serializer lookup.
+    """
+    return JsonResponse(get_task_stats())
+
+
+# Columns TaskListSerializer renders, read as plain rows for the task list endpoints
+TASK_LIST_VALUES = (
+    'id', 'title', 'description', 'category__name', 'category__color',
+    'priority', 'priority_score', 'deadline', 'status', 'created_at'
 )
-from ai_service.services import AIService
+_datetime_field = serializers.DateTimeField()
+
+
+def task_list_values(queryset):
+    """Task queryset as values() rows for task_list_data"""
+    return queryset.values(*TASK_LIST_VALUES)
+
+
+def task_list_data(rows):
+    """
+    TaskListSerializer output for values() rows, built without binding a
+    serializer field per row. Tasks without a category get null names.
+    """
+    now = timezone.now()
+    data = []
+    for row in rows:
+        deadline = row['deadline']
+        data.append({
+            'id': str(row['id']),
+            'title': row['title'],
+            'description': row['description'],
+            'category_name': row['category__name'],
+            'category_color': row['category__color'],
+            'priority': row['priority'],
+            'priority_score': row['priority_score'],
+            'deadline': _datetime_field.to_representation(deadline) if deadline else None,
+            'status': row['status'],
+            'is_overdue': deadline is not None and row['status'] != 'completed' and now > deadline,
+            'created_at': _datetime_field.to_representation(row['created_at']),
+        })
+    return data
 
 
 class CategoryViewSet(viewsets.ModelViewSet):
@@ -27,9 +141,12 @@ class CategoryViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def popular(self, request):
         """Get most frequently used categories"""
-        categories = self.queryset.order_by('-usage_frequency')[:5]
-        serializer = self.get_serializer(categories, many=True)
-        return Response(serializer.data)
+        def serialize_popular():
+            categories = self.get_queryset().order_by('-usage_frequency')[:5]
+            return self.get_serializer(categories, many=True).data
+        
+        data = cache.get_or_set(POPULAR_CATEGORIES_CACHE_KEY, serialize_popular, READ_CACHE_TIMEOUT)
+        return Response(data)
 
 
 class ContextEntryViewSet(viewsets.ModelViewSet):
@@ -43,14 +160,34 @@ class ContextEntryViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def create(self, request, *args, **kwargs):
-        """Create context entry with AI processing"""
+        """
+        Create context entry with AI processing.
+        With "async": true the entry is stored right away, the analysis is queued on
+        a Celery worker and the response is 202 Accepted with an ai_task_id. If the
+        broker is unreachable the analysis runs in the request instead (201).
+        """
         serializer = ContextCreateSerializer(data=request.data)
         if serializer.is_valid():
             # Process with AI
-            ai_service = AIService()
+            ai_service = get_ai_service()
             content = serializer.validated_data['content']
             source_type = serializer.validated_data['source_type']
             
+            if request.data.get('async'):
+                context_entry = ContextEntry.objects.create(content=content, source_type=source_type)
+                ai_task_id = queue_ai_job(process_context_entry, context_entry.pk)
+                if ai_task_id:
+                    data = dict(ContextEntrySerializer(context_entry).data, ai_task_id=ai_task_id)
+                    return Response(data, status=status.HTTP_202_ACCEPTED)
+                
+                # The entry already exists, so analyse it in place rather than failing the request
+                try:
+                    process_context_entry(str(context_entry.pk))
+                    context_entry.refresh_from_db(fields=['processed_insights', 'updated_at'])
+                except Exception as e:
+                    logger.warning("Context analysis failed for %s: %s", context_entry.pk, e)
+                return Response(ContextEntrySerializer(context_entry).data, status=status.HTTP_201_CREATED)
+            
             try:
                 insights = ai_service.process_context(content, source_type)
                 
@@ -76,7 +213,13 @@ class ContextEntryViewSet(viewsets.ModelViewSet):
         """Get recent context entries"""
         days = int(request.query_params.get('days', 7))
         cutoff_date = timezone.now() - timedelta(days=days)
-        recent_contexts = self.queryset.filter(created_at__gte=cutoff_date)
+        recent_contexts = self.get_queryset().filter(created_at__gte=cutoff_date).order_by('-created_at')
+        
+        # Page through the range instead of serializing every entry at once
+        page = self.paginate_queryset(recent_contexts)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(recent_contexts, many=True)
         return Response(serializer.data)
 
@@ -91,6 +234,18 @@ class TaskViewSet(viewsets.ModelViewSet):
     ordering_fields = ['priority_score', 'deadline', 'created_at', 'updated_at']
     ordering = ['-priority_score', 'deadline']
 
+    def get_queryset(self):
+        """Join the category, which every task serializer renders"""
+        return super().get_queryset().select_related('category')
+
+    def list(self, request, *args, **kwargs):
+        """List tasks (paginated), rendered from a values() query"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(task_list_values(queryset))
+        if page is not None:
+            return self.get_paginated_response(task_list_data(page))
+        return Response(task_list_data(task_list_values(queryset)))
+
     def get_serializer_class(self):
         """Use different serializers for different actions"""
         if self.action == 'list':
@@ -100,7 +255,12 @@ class TaskViewSet(viewsets.ModelViewSet):
         return TaskSerializer
 
     def create(self, request, *args, **kwargs):
-        """Create task with optional AI suggestions"""
+        """
+        Create task with optional AI suggestions.
+        With "async": true the suggestions are fetched by a Celery worker and the
+        response is 202 Accepted with an ai_task_id. If the broker is unreachable
+        they are fetched in the request instead (201).
+        """
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
             get_ai_suggestions = serializer.validated_data.pop('get_ai_suggestions', False)
@@ -108,11 +268,15 @@ class TaskViewSet(viewsets.ModelViewSet):
             # Create task
             task = serializer.save()
             
-            # Get AI suggestions if requested
-            if get_ai_suggestions:
+            ai_task_id = None
+            if get_ai_suggestions and request.data.get('async'):
+                ai_task_id = queue_ai_job(enrich_task_with_ai, task.pk)
+            
+            # Get AI suggestions if requested (also when they could not be queued)
+            if get_ai_suggestions and not ai_task_id:
                 try:
-                    ai_service = AIService()
-                    contexts = ContextEntry.objects.all()[:10]  # Recent contexts
+                    ai_service = get_ai_service()
+                    contexts = get_recent_contexts()
                     
                     suggestions = ai_service.get_task_suggestions(
                         task.title,
@@ -122,17 +286,36 @@ class TaskViewSet(viewsets.ModelViewSet):
                     
                     # Update task with AI suggestions
                     task.ai_suggestions = suggestions
-                    task.save()
+                    task.save(update_fields=['ai_suggestions'])
                     
                 except Exception as e:
                     # Continue even if AI suggestions fail
                     pass
             
+            # Re-read once with the category joined (the serializer only set category_id),
+            # which also picks up the usage count incremented in the database
+            if task.category_id:
+                task = self.get_queryset().get(pk=task.pk)
             response_serializer = TaskSerializer(task)
+            if ai_task_id:
+                return Response(
+                    dict(response_serializer.data, ai_task_id=ai_task_id),
+                    status=status.HTTP_202_ACCEPTED
+                )
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
         
-        # Log validation errors for debugging
-        print(f"Task creation validation errors: {serializer.errors}")
+        # Log validation errors for debugging, formatted only when DEBUG is enabled
+        logger.debug("Task creation validation errors: %s", serializer.errors)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create a list of tasks, resolving their categories in one batch"""
+        serializer = TaskCreateSerializer(data=request.data, many=True)
+        if serializer.is_valid():
+            tasks = serializer.save()
+            response_serializer = TaskSerializer(tasks, many=True)
+            return Response(response_serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['post'])
@@ -140,8 +323,8 @@ class TaskViewSet(viewsets.ModelViewSet):
         """Get AI suggestions for a specific task"""
         try:
             task = self.get_object()
-            ai_service = AIService()
-            contexts = ContextEntry.objects.all()[:10]
+            ai_service = get_ai_service()
+            contexts = get_recent_contexts()
             
             suggestions = ai_service.get_task_suggestions(
                 task.title,
@@ -160,75 +343,41 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    @action(detail=False, methods=['get'])
-    def stats(self, request):
-        """Get task statistics"""
-        total_tasks = self.queryset.count()
-        completed_tasks = self.queryset.filter(status='completed').count()
-        in_progress_tasks = self.queryset.filter(status='in-progress').count()
-        overdue_tasks = self.queryset.filter(
-            deadline__lt=timezone.now(),
-            status__in=['todo', 'in-progress']
-        ).count()
-        urgent_tasks = self.queryset.filter(priority='urgent').count()
-        
-        # Calculate productivity score
-        productivity_score = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        # Calculate burnout risk
-        burnout_risk = (urgent_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        stats = {
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'in_progress_tasks': in_progress_tasks,
-            'overdue_tasks': overdue_tasks,
-            'urgent_tasks': urgent_tasks,
-            'productivity_score': productivity_score,
-            'burnout_risk': burnout_risk,
-        }
-        
-        serializer = TaskStatsSerializer(data=stats)
-        if serializer.is_valid():
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
     @action(detail=False, methods=['get'])
     def overdue(self, request):
         """Get overdue tasks"""
-        overdue_tasks = self.queryset.filter(
+        overdue_tasks = self.get_queryset().filter(
             deadline__lt=timezone.now(),
             status__in=['todo', 'in-progress']
         )
-        serializer = TaskListSerializer(overdue_tasks, many=True)
-        return Response(serializer.data)
+        return Response(task_list_data(task_list_values(overdue_tasks)))
 
     @action(detail=False, methods=['get'])
     def urgent(self, request):
         """Get urgent tasks"""
-        urgent_tasks = self.queryset.filter(priority='urgent')
-        serializer = TaskListSerializer(urgent_tasks, many=True)
-        return Response(serializer.data)
+        urgent_tasks = self.get_queryset().filter(priority='urgent')
+        return Response(task_list_data(task_list_values(urgent_tasks)))
 
     @action(detail=False, methods=['get'])
     def by_status(self, request):
         """Get tasks grouped by status"""
         status_param = request.query_params.get('status', 'todo')
-        tasks = self.queryset.filter(status=status_param)
-        serializer = TaskListSerializer(tasks, many=True)
-        return Response(serializer.data)
+        if status_param not in Task.STATUS_VALUES:
+            # Unknown statuses can never match, skip the query
+            return Response([])
+        tasks = self.get_queryset().filter(status=status_param)
+        return Response(task_list_data(task_list_values(tasks)))
 
     @action(detail=False, methods=['get'])
     def by_category(self, request):
         """Get tasks grouped by category"""
         category_id = request.query_params.get('category_id')
         if category_id:
-            tasks = self.queryset.filter(category_id=category_id)
+            tasks = self.get_queryset().filter(category_id=category_id)
         else:
-            tasks = self.queryset.exclude(category__isnull=True)
+            tasks = self.get_queryset().exclude(category__isnull=True)
         
-        serializer = TaskListSerializer(tasks, many=True)
-        return Response(serializer.data)
+        return Response(task_list_data(task_list_values(tasks)))
 
 
 class TaskAnalyticsViewSet(viewsets.ModelViewSet):
@@ -241,7 +390,7 @@ class TaskAnalyticsViewSet(viewsets.ModelViewSet):
     def generate(self, request):
         """Generate new analytics"""
         try:
-            ai_service = AIService()
+            ai_service = get_ai_service()
             tasks = Task.objects.all()
             contexts = ContextEntry.objects.all()
             
@@ -252,9 +401,9 @@ class TaskAnalyticsViewSet(viewsets.ModelViewSet):
                 burnout_risk=insights['burnout'],
                 focus_areas=insights['focus'],
                 recommendations=insights['recommendations'],
-                total_tasks=tasks.count(),
-                completed_tasks=tasks.filter(status='completed').count(),
-                urgent_tasks=tasks.filter(priority='urgent').count(),
+                total_tasks=insights['total_tasks'],
+                completed_tasks=insights['completed_tasks'],
+                urgent_tasks=insights['urgent_tasks'],
             )
             
             serializer = self.get_serializer(analytics)
@@ -269,8 +418,11 @@ class TaskAnalyticsViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def latest(self, request):
         """Get latest analytics"""
-        latest_analytics = self.queryset.first()
-        if latest_analytics:
-            serializer = self.get_serializer(latest_analytics)
-            return Response(serializer.data)
+        def serialize_latest():
+            latest_analytics = self.get_queryset().first()
+            return self.get_serializer(latest_analytics).data if latest_analytics else None
+        
+        data = cache.get_or_set(LATEST_ANALYTICS_CACHE_KEY, serialize_latest, READ_CACHE_TIMEOUT)
+        if data is not None:
+            return Response(data)
         return Response({'error': 'No analytics available'}, status=status.HTTP_404_NOT_FOUND)